@@ -0,0 +1,210 @@
+"""Classificação de missões em abas e seções (ativas/atrasadas/concluídas) sobre colunas.
+
+Com NumPy instalado a classificação do dia é vetorizada; sem ele, o mesmo
+resultado sai de um loop sobre as colunas.
+"""
+from recurrence import occurs_on
+
+try:
+    import numpy as np
+except ImportError:  # opcional
+    np = None
+
+TABS = ("DIÁRIAS", "SEMANAIS", "MENSAIS")
+STATUS = ("Pendente", "Atrasada", "Concluída", "deleted")
+DONE = STATUS.index("Concluída")
+DELETED = STATUS.index("deleted")
+OTHER_STATUS = len(STATUS)
+NO_TAB = -1
+NO_DUE = 0  # ordinal reservado para missão sem prazo
+
+
+class MissionColumns:
+    """Missões (visões do data_manager) em colunas, na ordem em que vieram.
+
+    due: prazo como ordinal (NO_DUE sem prazo); status e tab: códigos em STATUS
+    e TABS; repeat: máscara de repetição (bit 0 = segunda). `order` são as
+    posições ordenadas por id, a ordem em que as telas listam. As regras que a
+    máscara não resolve (a cada N dias, mensal, com início/fim) ficam em `rules`,
+    por posição, e são avaliadas só no dia consultado.
+    """
+
+    def __init__(self, missions):
+        self.missions = missions
+        self.rules = {i: m.rule for i, m in enumerate(missions) if m.rule is not None and not m.repeat_mask}
+        rows = [_row(m) for m in missions]
+        ids = [m["id"] for m in missions]
+        if np is not None:
+            self.due = np.array([r[0] for r in rows], dtype=np.int32)
+            self.status = np.array([r[1] for r in rows], dtype=np.int8)
+            self.tab = np.array([r[2] for r in rows], dtype=np.int8)
+            self.repeat = np.array([r[3] for r in rows], dtype=np.uint8)
+            self.ids = np.array(ids, dtype=np.int64)
+        else:
+            self.due, self.status, self.tab, self.repeat = (list(c) for c in zip(*rows)) if rows else ([], [], [], [])
+            self.ids = ids
+        self._sort()
+
+    def __len__(self):
+        return len(self.missions)
+
+    def take(self, indices):
+        missions = self.missions
+        return [missions[i] for i in indices]
+
+    def update(self, missions):
+        """Troca as visões por `missions` refazendo só as linhas que mudaram.
+
+        Missões novas no fim (o caso de criar missão) só estendem as colunas.
+        Retorna False (e não altera nada) quando a lista encolheu ou mudou demais
+        para valer a pena; aí é melhor construir do zero.
+        """
+        old = self.missions
+        n = len(old)
+        if len(missions) < n:
+            return False
+        changed = [i for i, (a, b) in enumerate(zip(old, missions)) if a is not b]
+        if len(changed) > max(16, n // 10):
+            return False
+        reorder = False
+        for i in changed:
+            m = missions[i]
+            self.due[i], self.status[i], self.tab[i], self.repeat[i] = _row(m)
+            self._set_rule(i, m)
+            if self.ids[i] != m["id"]:
+                self.ids[i] = m["id"]
+                reorder = True
+
+        added = missions[n:]
+        if added:
+            self._extend(added, n, reorder)
+        elif reorder:
+            self._sort()
+        self.missions = missions
+        return True
+
+    def _set_rule(self, i, m):
+        if m.rule is not None and not m.repeat_mask:
+            self.rules[i] = m.rule
+        else:
+            self.rules.pop(i, None)
+
+    def _extend(self, added, start, reorder):
+        rows = [_row(m) for m in added]
+        ids = [m["id"] for m in added]
+        for i, m in enumerate(added, start):
+            self._set_rule(i, m)
+        # Ids novos maiores que todos os anteriores (o normal): a ordem só ganha o fim
+        in_order = not reorder and ids == sorted(ids) and (not start or ids[0] > self._max_id())
+        if np is not None:
+            columns = zip(*rows)
+            self.due, self.status, self.tab, self.repeat = (
+                np.concatenate([column, np.array(values, dtype=column.dtype)])
+                for column, values in zip((self.due, self.status, self.tab, self.repeat), columns)
+            )
+            self.ids = np.concatenate([self.ids, np.array(ids, dtype=self.ids.dtype)])
+            if in_order:
+                self.order = np.concatenate([self.order, np.arange(start, start + len(ids), dtype=self.order.dtype)])
+                return
+        else:
+            for column, values in zip((self.due, self.status, self.tab, self.repeat), zip(*rows)):
+                column.extend(values)
+            self.ids.extend(ids)
+            if in_order:
+                self.order.extend(range(start, start + len(ids)))
+                return
+        self._sort()
+
+    def _max_id(self):
+        return int(self.ids.max()) if np is not None else max(self.ids)
+
+    def _sort(self):
+        if np is not None:
+            self.order = np.argsort(self.ids, kind="stable")
+        else:
+            self.order = sorted(range(len(self.ids)), key=self.ids.__getitem__)
+
+
+_STATUS_CODES = {s: i for i, s in enumerate(STATUS)}
+_TAB_CODES = {t: i for i, t in enumerate(TABS)}
+
+def _row(m):
+    due = m.due
+    return (
+        due.toordinal() if due else NO_DUE,
+        _STATUS_CODES.get(m["status"], OTHER_STATUS),
+        _TAB_CODES.get(m["tipo"], NO_TAB),
+        m.repeat_mask,
+    )
+
+
+_columns = None
+
+def columns_for(missions):
+    """Colunas de `missions` (a tupla de get_missions), atualizadas só onde as visões mudaram."""
+    global _columns
+    if _columns is None or not (_columns.missions is missions or _columns.update(missions)):
+        _columns = MissionColumns(missions)
+    return _columns
+
+
+def bucket(columns, today):
+    """{aba: {"active", "late", "done": índices em columns.missions}} para o dia `today`.
+
+    Mesmas regras do MissionScreen.load_all: concluída que não se repete hoje só
+    aparece se o prazo é hoje; repetida hoje ou com prazo a partir de hoje é ativa.
+    """
+    if np is not None:
+        return _bucket_numpy(columns, today)
+    return _bucket_python(columns, today)
+
+
+def _bucket_numpy(columns, today):
+    t, weekday = today.toordinal(), today.weekday()
+    due = np.where(columns.due == NO_DUE, t, columns.due)
+    repeats = (columns.repeat >> weekday) & 1 != 0
+    for i, rule in columns.rules.items():
+        repeats[i] = occurs_on(rule, today)
+    finished = (columns.status == DONE) & ~repeats
+
+    done = finished & (columns.due == t)
+    listed = (columns.status != DELETED) & ~finished
+    active = listed & (repeats | (due >= t))
+    late = listed & ~active
+
+    # Índices na ordem de id: filtra `order` em vez de ordenar cada resultado
+    order = columns.order
+    tab = columns.tab[order]
+    active, late, done = active[order], late[order], done[order]
+    result = {}
+    for code, name in enumerate(TABS):
+        in_tab = tab == code
+        result[name] = {
+            "active": order[active & in_tab],
+            "late": order[late & in_tab],
+            "done": order[done & in_tab],
+        }
+    return result
+
+
+def _bucket_python(columns, today):
+    t, bit = today.toordinal(), 1 << today.weekday()
+    result = {tab: {"active": [], "late": [], "done": []} for tab in TABS}
+    by_code = [result[tab] for tab in TABS]
+
+    due_col, status_col, tab_col, repeat_col = columns.due, columns.status, columns.tab, columns.repeat
+    rules = columns.rules
+    for i in columns.order:
+        due, status, tab, repeat = due_col[i], status_col[i], tab_col[i], repeat_col[i]
+        if tab == NO_TAB or status == DELETED:
+            continue
+        repeats = repeat & bit or (i in rules and occurs_on(rules[i], today))
+        if status == DONE and not repeats:
+            if due == t:
+                by_code[tab]["done"].append(i)
+            continue
+        if repeats or (due or t) >= t:
+            by_code[tab]["active"].append(i)
+        else:
+            by_code[tab]["late"].append(i)
+    return result
@@ -1,6 +1,21 @@
+import atexit
+import contextlib
+import gzip
 import json
 import os
+import sqlite3
 import sys
+import threading
+import types
+from collections.abc import Mapping
+
+import sqlite_backend
+from recurrence import is_plain_weekly, occurrences, occurs_on, rule_from_doc
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import datetime
 
@@ -20,8 +35,1036 @@ DATA_DIR = get_data_dir()
 DATA_FILE = os.path.join(DATA_DIR, "user.json")
 MISSIONS_DATA = os.path.join(DATA_DIR, "missions.json")
 FOCUS_DATA = os.path.join(DATA_DIR, "focus_history.json")
+FOCUS_JOURNAL = os.path.join(DATA_DIR, "focus_journal.jsonl")
 NOTES_FILE = os.path.join(DATA_DIR, "notes.json")
 CONFIG_PATH = os.path.join(DATA_DIR, "config.json")
+SEQUENCES_FILE = os.path.join(DATA_DIR, "sequences.json")
+LEDGER_FILE = os.path.join(DATA_DIR, "ledger.jsonl")
+SQLITE_PATH = os.path.join(DATA_DIR, "mytasks.db")
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+
+# Backend opcional: MYTASKS_STORAGE=sqlite importa os JSON uma vez e daí em diante usa o banco
+USE_SQLITE = os.getenv("MYTASKS_STORAGE", "").lower() == "sqlite" or os.path.exists(SQLITE_PATH)
+
+FLUSH_DELAY = 0.4  # segundos que uma rajada de saves espera antes de ir para o disco
+CHECKPOINT_DELAY = 60  # segundos entre a primeira sessão no journal e o checkpoint no histórico
+ARCHIVE_AFTER_DAYS = 30  # missões concluídas há mais tempo que isso saem do missions.json
+
+_stores = []
+_writers = []
+_listeners = []
+
+
+def add_listener(callback):
+    """Registra callback(evento, *args) para as mudanças dos stores.
+
+    É chamado com o lock do store segurado: o callback só deve enfileirar o evento.
+    """
+    _listeners.append(callback)
+
+
+def _notify(event, *args):
+    for callback in _listeners:
+        callback(event, *args)
+
+
+def _clone(obj):
+    # Cópia profunda só de dict/list, bem mais barata que copy.deepcopy ou reparsear o JSON
+    if isinstance(obj, dict):
+        return {k: _clone(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_clone(v) for v in obj]
+    return obj
+
+
+# ---------- codecs ----------
+
+class JsonCodec:
+    """JSON da biblioteca padrão; compacto por padrão, indentado para leitura humana."""
+
+    def __init__(self, indent=None):
+        self.indent = indent
+        self.name = "json-pretty" if indent else "json"
+        self._separators = None if indent else (",", ":")
+
+    def dumps(self, data):
+        return json.dumps(data, indent=self.indent, separators=self._separators, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+
+class OrjsonCodec:
+    """orjson, quando instalado: mesmo formato compacto, bem mais rápido."""
+
+    name = "orjson"
+
+    def dumps(self, data):
+        return orjson.dumps(data)
+
+    def loads(self, raw):
+        return orjson.loads(raw)
+
+
+class GzipCodec:
+    """Comprime a saída de outro codec; lê também arquivos antigos sem compressão."""
+
+    def __init__(self, inner, level=6):
+        self.inner = inner
+        self.level = level
+        self.name = f"gzip+{inner.name}"
+
+    def dumps(self, data):
+        return gzip.compress(self.inner.dumps(data), compresslevel=self.level, mtime=0)
+
+    def loads(self, raw):
+        if raw[:2] == b"\x1f\x8b":
+            try:
+                raw = gzip.decompress(raw)
+            except (OSError, EOFError) as e:
+                raise ValueError(f"gzip inválido: {e}") from e
+        return self.inner.loads(raw)
+
+
+DEFAULT_CODEC = OrjsonCodec() if orjson is not None else JsonCodec()
+PRETTY_CODEC = JsonCodec(indent=2)
+ARCHIVE_CODEC = GzipCodec(DEFAULT_CODEC)
+
+
+def _atomic_write(path, payload):
+    # Escreve num temporário e troca de uma vez: um crash nunca deixa o arquivo pela metade
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _stat_stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class CachedJsonFile:
+    """Mantém um arquivo JSON em memória e só relê quando mtime ou tamanho mudam.
+
+    Os saves são write-behind: o cache é atualizado na hora, o store fica sujo e
+    uma rajada de alterações vira um único flush atômico depois de FLUSH_DELAY.
+    """
+
+    event = None
+
+    def __init__(self, path, default, codec=DEFAULT_CODEC, tolerant=False, event=None):
+        self.path = path
+        self.default = default
+        self.codec = codec
+        self.tolerant = tolerant
+        if event:
+            self.event = event
+        self._data = None
+        self._flushed_data = None
+        self._loaded = False
+        self._stamp = None
+        self._version = 0
+        self._flushed_version = 0
+        self._timer = None
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        _stores.append(self)
+
+    def _file_stamp(self):
+        return _stat_stamp(self.path)
+
+    def _parse(self):
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            if not raw.strip() and self.tolerant:
+                return self.default()
+            return self.codec.loads(raw)
+        except ValueError:
+            if self.tolerant:
+                return self.default()
+            raise
+
+    def _persist(self, data):
+        _atomic_write(self.path, self.codec.dumps(data))
+
+    def _on_reload(self):
+        # _loaded só é falso na primeira carga, que não é mudança para ninguém
+        if self.event and self._loaded:
+            _notify(self.event)
+
+    @property
+    def dirty(self):
+        return self._version != self._flushed_version
+
+    def read(self):
+        # Retorna o objeto em cache: quem chama não pode alterá-lo
+        with self._lock:
+            if self.dirty:
+                # O que está na memória é mais novo que o disco
+                return self._data
+            stamp = self._file_stamp()
+            if self._data is None or stamp != self._stamp:
+                self._data = self._parse() if stamp else self.default()
+                self._flushed_data = self._data
+                self._stamp = stamp
+                self._on_reload()
+                self._loaded = True
+            return self._data
+
+    def write(self, data):
+        with self._lock:
+            self._data = _clone(data)
+            self._version += 1
+            self._on_reload()
+            self._loaded = True
+            if self._timer is None:
+                self._timer = threading.Timer(FLUSH_DELAY, _submit_flush, (self,))
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self.dirty:
+                    return
+                version = self._version
+                data = self._data
+
+            try:
+                # _data nunca é alterado no lugar, então dá para serializar fora do lock
+                self._persist(data)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Erro ao salvar {self.path}: {e}")
+                self._rollback(version, e)
+                return
+
+            with self._lock:
+                self._flushed_version = version
+                self._flushed_data = data
+                self._stamp = self._file_stamp()
+
+    def _rollback(self, version, error):
+        # O save falhou: se nada mais novo foi escrito, o cache volta ao que está
+        # no disco e os eventos de mudança desfazem nas telas o que já mostravam
+        with self._lock:
+            if self._version == version:
+                self._data = self._flushed_data if self._flushed_data is not None else self.default()
+                self._flushed_version = version
+                self._on_reload()
+        _notify("save_failed", self.path, str(error))
+
+
+def check_external_changes():
+    """Relê os stores já carregados cujo arquivo mudou fora do app (dispara os eventos)."""
+    for store in list(_stores):
+        if store._data is not None:
+            store.read()
+
+
+def flush_all():
+    """Grava imediatamente tudo o que ainda está pendente."""
+    for writer in _writers:
+        writer.flush()
+    for store in _stores:
+        store.flush()
+
+
+_flush_executor = None
+
+def set_flush_executor(submit):
+    """Entrega os flushes a `submit(store)` (o io_worker) em vez de gravar na thread que pediu."""
+    global _flush_executor
+    _flush_executor = submit
+
+def _submit_flush(store):
+    if _flush_executor is None:
+        store.flush()
+    else:
+        _flush_executor(store)
+
+
+atexit.register(flush_all)
+
+
+class PendingWrites:
+    """Fila de gravações que não são um arquivo em cache (ledger, contadores no SQLite).
+
+    add() só enfileira e pede um flush ao io_worker; flush() grava tudo o que
+    estiver na fila com `write(itens)`, um flush por vez e na ordem dos pedidos.
+    Se a gravação falhar, os itens continuam na fila para o próximo flush.
+    """
+
+    def __init__(self, path, write):
+        self.path = path
+        self._write = write
+        self._pending = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        _writers.append(self)
+
+    def add(self, items):
+        with self._lock:
+            self._pending.extend(items)
+        _submit_flush(self)
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def flush(self):
+        with self._io_lock:
+            items = self.pending()
+            if not items:
+                return
+            try:
+                self._write(items)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Erro ao salvar {self.path}: {e}")
+                _notify("save_failed", self.path, str(e))
+                return
+            with self._lock:
+                del self._pending[:len(items)]
+
+
+class Transaction:
+    """Unidade de trabalho: guarda em memória as cópias de trabalho lidas e salvas dentro dela."""
+
+    def __init__(self):
+        self._staged = {}
+        self._saved = []
+        self._on_commit = []
+        self._on_rollback = []
+
+    def load(self, store, loader):
+        # Dentro da transação todo mundo recebe a mesma cópia de trabalho do store
+        if store not in self._staged:
+            self._staged[store] = loader()
+        return self._staged[store]
+
+    def save(self, store, data):
+        self._staged[store] = data
+        if store not in self._saved:
+            self._saved.append(store)
+
+    def on_commit(self, callback):
+        """Roda `callback` no commit, antes dos stores serem gravados (se falhar, nada é gravado)."""
+        self._on_commit.append(callback)
+
+    def on_rollback(self, callback):
+        """Roda `callback` se o bloco da transação levantar exceção ou um on_commit falhar."""
+        self._on_rollback.append(callback)
+
+    def commit(self):
+        try:
+            for callback in self._on_commit:
+                callback()
+        except BaseException:
+            self.rollback()
+            raise
+        for store in self._saved:
+            store.write(self._staged[store])
+        for store in self._saved:
+            _submit_flush(store)
+
+    def rollback(self):
+        for callback in self._on_rollback:
+            callback()
+
+
+_tx_local = threading.local()
+
+
+@contextlib.contextmanager
+def transaction():
+    """Agrupa load/save de missões, usuário e config num único commit.
+
+    Os saves feitos dentro do bloco ficam em memória e vão para o disco juntos
+    no final (pelo io_worker, quando instalado); se o bloco levantar exceção,
+    nada é gravado e os callbacks de on_rollback rodam. Transações aninhadas
+    entram na de fora. get_missions/get_mission continuam vendo o estado gravado.
+    """
+    outer = getattr(_tx_local, "tx", None)
+    if outer is not None:
+        yield outer
+        return
+
+    tx = _tx_local.tx = Transaction()
+    try:
+        yield tx
+    except BaseException:
+        _tx_local.tx = None
+        tx.rollback()
+        raise
+    _tx_local.tx = None
+    tx.commit()
+
+
+def _load_staged(store, loader):
+    tx = getattr(_tx_local, "tx", None)
+    return tx.load(store, loader) if tx is not None else loader()
+
+
+def _save_staged(store, data):
+    tx = getattr(_tx_local, "tx", None)
+    if tx is not None:
+        tx.save(store, data)
+    else:
+        store.write(data)
+
+
+# ---------- modelos ----------
+
+def _parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def _parse_datetime(value):
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def _parse_minutes(value):
+    # "HH:MM" -> minutos desde a meia-noite
+    try:
+        h, m = value.split(":")
+        return int(h) * 60 + int(m)
+    except (AttributeError, ValueError):
+        return None
+
+
+class _Model(Mapping):
+    """Visão somente leitura de um registro, com os campos conhecidos em __slots__.
+
+    Funciona como o dict original (m["x"], m.get, dict(m)); chaves desconhecidas
+    ficam em _extra. Os campos derivados são calculados uma vez, na construção.
+    """
+
+    FIELDS = ()
+    __slots__ = ("_extra",)
+
+    def __init__(self, doc):
+        extra = None
+        fields = self._field_set
+        for key, value in doc.items():
+            if key in fields:
+                object.__setattr__(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(self, "_extra", extra)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} é somente leitura")
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self):
+        """Cópia em dict, pronta para alterar e salvar."""
+        return _clone(dict(self))
+
+
+class Mission(_Model):
+    FIELDS = (
+        "id", "titulo", "status", "xp", "categoria", "prazo", "data_criacao",
+        "horario_inicio", "horario_fim", "descricao", "repetida", "tipo", "completada_count",
+        "recorrencia", "data_conclusao",
+    )
+    __slots__ = FIELDS + ("due", "start_min", "end_min", "rule", "repeat_mask")
+
+    def __init__(self, doc):
+        super().__init__(doc)
+        rule = rule_from_doc(doc)
+        object.__setattr__(self, "due", _parse_date(doc.get("prazo")))
+        object.__setattr__(self, "start_min", _parse_minutes(doc.get("horario_inicio")))
+        object.__setattr__(self, "end_min", _parse_minutes(doc.get("horario_fim")))
+        object.__setattr__(self, "rule", rule)
+        # Só a máscara semanal sem limites; as outras regras respondem por occurs_on
+        object.__setattr__(self, "repeat_mask", rule.mask if is_plain_weekly(rule) else 0)
+
+    def repeats_on(self, weekday):
+        return bool(self.repeat_mask >> weekday & 1)
+
+    def occurs_on(self, day):
+        return occurs_on(self.rule, day)
+
+
+class Note(_Model):
+    FIELDS = ("id", "title", "text", "color", "pinned", "created_at")
+    __slots__ = FIELDS
+
+
+class Session(_Model):
+    FIELDS = ("mode", "start", "end", "elapsed", "mission_id")
+    __slots__ = FIELDS + ("started", "ended")
+
+    def __init__(self, doc):
+        super().__init__(doc)
+        object.__setattr__(self, "started", _parse_datetime(doc.get("start")))
+        object.__setattr__(self, "ended", _parse_datetime(doc.get("end")))
+
+
+class MissionIndex:
+    """Índices secundários das missões, atualizados missão a missão.
+
+    Missões apagadas (status "deleted") só entram em by_id e by_tab_status.
+    """
+
+    def __init__(self):
+        self.by_id = {}
+        self.by_date = {}
+        self.by_weekday = [set() for _ in range(7)]
+        # Regras que não são só uma máscara semanal (a cada N dias, mensal, com início/fim)
+        self.recurring = set()
+        self.by_tab_status = {}
+        self.timed = set()
+        # Visões na ordem do arquivo, publicadas junto com os índices
+        self.views = ()
+
+    def copy(self):
+        # Cópia para alterar fora da vista de quem lê: os conjuntos são novos, as visões as mesmas
+        new = MissionIndex()
+        new.by_id = dict(self.by_id)
+        new.by_date = {k: set(v) for k, v in self.by_date.items()}
+        new.by_weekday = [set(v) for v in self.by_weekday]
+        new.recurring = set(self.recurring)
+        new.by_tab_status = {k: set(v) for k, v in self.by_tab_status.items()}
+        new.timed = set(self.timed)
+        new.views = self.views
+        return new
+
+    @staticmethod
+    def _bucket(index, key):
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = set()
+        return bucket
+
+    def add(self, m):
+        mid = m["id"]
+        self.by_id[mid] = m
+        self._bucket(self.by_tab_status, (m["tipo"], m["status"])).add(mid)
+        if m["status"] == "deleted":
+            return
+        if m["prazo"]:
+            self._bucket(self.by_date, m["prazo"]).add(mid)
+        for weekday in range(7):
+            if m.repeat_mask >> weekday & 1:
+                self.by_weekday[weekday].add(mid)
+        if m.rule is not None and not m.repeat_mask:
+            self.recurring.add(mid)
+        if m["horario_inicio"]:
+            self.timed.add(mid)
+
+    def remove(self, m):
+        mid = m["id"]
+        self.by_id.pop(mid, None)
+        for index, key in ((self.by_tab_status, (m["tipo"], m["status"])), (self.by_date, m["prazo"])):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(mid)
+                if not bucket:
+                    del index[key]
+        for bucket in self.by_weekday:
+            bucket.discard(mid)
+        self.recurring.discard(mid)
+        self.timed.discard(mid)
+
+    def missions(self, ids):
+        return [self.by_id[i] for i in sorted(ids)]
+
+
+class MissionStore(CachedJsonFile):
+    """Cache de missões do processo, com visões somente leitura e índices secundários."""
+
+    def __init__(self, path):
+        super().__init__(path, lambda: {"missions": []})
+        self._index = MissionIndex()
+
+    def _on_reload(self):
+        # Pode rodar no io_worker (rollback, mudança externa) enquanto a GUI lê:
+        # os índices novos são montados numa cópia e publicados numa só atribuição
+        index = self._index.copy()
+        old = dict(index.by_id)
+        views = []
+        events = []
+        for m in self._data.get("missions", []):
+            previous = old.pop(m["id"], None)
+            if previous is not None and previous == m:
+                views.append(previous)
+            else:
+                # Só as missões que mudaram saem e voltam aos índices
+                if previous is not None:
+                    index.remove(previous)
+                view = Mission(m)
+                index.add(view)
+                views.append(view)
+                events.append(("mission_added" if previous is None else "mission_changed", m["id"]))
+        for mid, previous in old.items():
+            index.remove(previous)
+            events.append(("mission_removed", mid))
+        index.views = tuple(views)
+        self._index = index
+        if self._loaded:
+            for event, mid in events:
+                _notify(event, mid)
+
+    def views(self):
+        self.read()
+        return self._index.views
+
+    def get(self, mission_id):
+        self.read()
+        return self._index.by_id.get(mission_id)
+
+    def for_day(self, day, with_time=False):
+        self.read()
+        index = self._index
+        ids = index.by_date.get(day.isoformat(), set()) | index.by_weekday[day.weekday()]
+        ids |= {mid for mid in index.recurring if index.by_id[mid].occurs_on(day)}
+        if with_time:
+            ids &= index.timed
+        return index.missions(ids)
+
+    def between(self, start, end):
+        """{dia: [missões]} de start a end: prazo no dia ou ocorrência da regra de repetição."""
+        self.read()
+        index = self._index
+        days = {}
+        span = (end - start).days
+        for offset in range(span + 1):
+            day = start + datetime.timedelta(days=offset)
+            for mid in index.by_date.get(day.isoformat(), ()):
+                days.setdefault(day, set()).add(mid)
+        recurring = set(index.recurring).union(*index.by_weekday)
+        for mid in recurring:
+            for day in occurrences(index.by_id[mid].rule, start, end):
+                days.setdefault(day, set()).add(mid)
+        return {day: index.missions(ids) for day, ids in sorted(days.items())}
+
+    def by_tab(self, tipo):
+        self.read()
+        return self._tab_missions(lambda t, st: t == tipo and st != "deleted")
+
+    def open_missions(self):
+        self.read()
+        return self._tab_missions(lambda t, st: st not in ("Concluída", "deleted"))
+
+    def _tab_missions(self, accept):
+        index = self._index
+        ids = set()
+        for (tipo, status), bucket in index.by_tab_status.items():
+            if accept(tipo, status):
+                ids |= bucket
+        return index.missions(ids)
+
+
+class SqliteStoreMixin:
+    """Base dos stores em SQLite: o "carimbo" de mudança externa é o data_version da conexão."""
+
+    def _file_stamp(self):
+        with _db_lock:
+            return sqlite_backend.data_version(_db)
+
+    def _fresh(self):
+        # Consultas indexadas vão direto ao banco, então o que está pendente precisa ir antes
+        if self.dirty:
+            self.flush()
+
+    # No banco a versão do schema de cada tipo fica na tabela meta (chamar com _db_lock)
+    def _load_schema_version(self, kind):
+        self._schema_version = int(sqlite_backend.get_meta(_db, f"schema_{kind}", 0))
+        return self._schema_version
+
+    def _save_schema_version(self, kind, version):
+        if version != getattr(self, "_schema_version", 0):
+            sqlite_backend.set_meta(_db, f"schema_{kind}", version)
+            self._schema_version = version
+
+
+class SqliteMissionStore(SqliteStoreMixin, MissionStore):
+    def __init__(self):
+        super().__init__(SQLITE_PATH)
+        self._persisted = {}
+
+    def _parse(self):
+        with _db_lock:
+            missions = sqlite_backend.load_missions(_db)
+            version = self._load_schema_version("missions")
+        self._persisted = {m["id"]: m for m in _clone(missions)}
+        return {"schema_version": version, "missions": missions}
+
+    def _persist(self, data):
+        missions = data.get("missions", [])
+        changed = [m for m in missions if self._persisted.get(m["id"]) != m]
+        removed = set(self._persisted) - {m["id"] for m in missions}
+        with _db_lock:
+            sqlite_backend.save_missions(_db, changed, removed)
+            self._save_schema_version("missions", data.get("schema_version", 0))
+        self._persisted = {m["id"]: m for m in missions}
+
+    def get(self, mission_id):
+        if self._data is not None and not self.dirty and self._stamp == self._file_stamp():
+            return self._index.by_id.get(mission_id)
+        self._fresh()
+        with _db_lock:
+            m = sqlite_backend.get_mission(_db, mission_id)
+        return Mission(m) if m else None
+
+    def for_day(self, day, with_time=False):
+        self._fresh()
+        with _db_lock:
+            rows = sqlite_backend.missions_for_day(_db, day, with_time)
+        # O SQL traz candidatas pela máscara; a regra decide se ocorrem no dia
+        views = (Mission(m) for m in rows)
+        return [m for m in views if m["prazo"] == day.isoformat() or m.occurs_on(day)]
+
+    def between(self, start, end):
+        self._fresh()
+        with _db_lock:
+            rows = sqlite_backend.missions_between(_db, start, end)
+        # Mesma filtragem fina do for_day, agora expandindo a regra na janela
+        days = {}
+        for m in map(Mission, rows):
+            found = set(occurrences(m.rule, start, end))
+            if m.due and start <= m.due <= end:
+                found.add(m.due)
+            for day in found:
+                days.setdefault(day, []).append(m)
+        return dict(sorted(days.items()))
+
+    def by_tab(self, tipo):
+        self._fresh()
+        with _db_lock:
+            rows = sqlite_backend.missions_by_tab(_db, tipo)
+        return [Mission(m) for m in rows]
+
+    def open_missions(self):
+        self._fresh()
+        with _db_lock:
+            rows = sqlite_backend.open_missions(_db)
+        return [Mission(m) for m in rows]
+
+
+def _with_session(history, day_key, session):
+    # Devolve um histórico novo sem tocar no anterior (o flush pode estar serializando ele)
+    day = history.get(day_key) or {"total_seconds": 0, "sessions": []}
+    if any(s.get("start") == session.get("start") for s in day["sessions"]):
+        # Já estava no checkpoint: o journal pode ser relido depois de um crash no meio do checkpoint
+        return history
+    merged = dict(history)
+    merged[day_key] = {
+        **day,
+        "total_seconds": day.get("total_seconds", 0) + session.get("elapsed", 0),
+        "sessions": day["sessions"] + [session],
+    }
+    return merged
+
+
+def _read_journal(path, codec):
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = codec.loads(line)
+            except ValueError:
+                # Última linha cortada por um crash durante o append
+                continue
+            yield record["day"], record["session"]
+
+
+def _read_focus_files(path, journal_path, codec=DEFAULT_CODEC):
+    """Checkpoint com as sessões do journal por cima: (histórico, linhas do journal)."""
+    history = {}
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            history = codec.loads(raw) if raw.strip() else {}
+        except ValueError:
+            history = {}
+    count = 0
+    for day_key, session in _read_journal(journal_path, codec):
+        history = _with_session(history, day_key, session)
+        count += 1
+    return history, count
+
+
+class FocusRollups:
+    """Totais de foco por dia, semana ISO, mês e geral, atualizados a cada sessão."""
+
+    def __init__(self, history=None):
+        self.days = {}
+        self.weeks = {}
+        self.months = {}
+        self.total = 0
+        for day_key, info in (history or {}).items():
+            self.add(day_key, info.get("total_seconds", 0))
+
+    def add(self, day_key, seconds):
+        self.days[day_key] = self.days.get(day_key, 0) + seconds
+        self.total += seconds
+        try:
+            d = datetime.date.fromisoformat(day_key)
+        except ValueError:
+            return
+        week = self.week_key(d)
+        self.weeks[week] = self.weeks.get(week, 0) + seconds
+        self.months[d.strftime("%Y-%m")] = self.months.get(d.strftime("%Y-%m"), 0) + seconds
+
+    def copy(self):
+        new = FocusRollups()
+        new.days, new.weeks, new.months = dict(self.days), dict(self.weeks), dict(self.months)
+        new.total = self.total
+        return new
+
+    @staticmethod
+    def week_key(d):
+        year, week, _ = d.isocalendar()
+        return f"{year}-W{week:02d}"
+
+
+class FocusRollupMixin:
+    # O rollup é refeito só quando o histórico inteiro muda (load/save); sessões novas somam nele
+    _rollups = None
+    # O histórico é um dict por dia: a versão do schema fica fora dele
+    schema_version = 0
+
+    def _on_reload(self):
+        old = self._rollups
+        self._rollups = FocusRollups(self._data)
+        if self._loaded and old is not None:
+            for day_key in set(old.days) | set(self._rollups.days):
+                if old.days.get(day_key) != self._rollups.days.get(day_key):
+                    _notify("focus_session_added", day_key)
+
+    def rollups(self):
+        self.read()
+        return self._rollups
+
+    def _add_session_rollup(self, day_key, seconds):
+        # append roda no io_worker: soma numa cópia e publica, sem mexer no que a GUI está lendo
+        rollups = self._rollups.copy()
+        rollups.add(day_key, seconds)
+        self._rollups = rollups
+
+
+class FocusHistoryStore(FocusRollupMixin, CachedJsonFile):
+    """Histórico de foco = checkpoint (focus_history.json) + journal JSONL só de append.
+
+    Cada sessão nova vira uma linha no journal; de tempos em tempos o journal é
+    incorporado ao checkpoint em segundo plano e truncado.
+    """
+
+    def __init__(self, path, journal_path):
+        super().__init__(path, dict, tolerant=True)
+        self.journal_path = journal_path
+        self._journal_count = 0
+        self._checkpoint_timer = None
+
+    def _file_stamp(self):
+        return (_stat_stamp(self.path), _stat_stamp(self.journal_path))
+
+    def _parse(self):
+        history, self._journal_count = _read_focus_files(self.path, self.journal_path, self.codec)
+        self.schema_version = history.pop("schema_version", 0)
+        return history
+
+    def _persist(self, data):
+        if self.schema_version:
+            data = {"schema_version": self.schema_version, **data}
+        super()._persist(data)
+
+    def day(self, day_key):
+        return self.read().get(day_key)
+
+    def append(self, day_key, session):
+        line = self.codec.dumps({"day": day_key, "session": session})
+        self.read()
+        with self._lock:
+            try:
+                with open(self.journal_path, "ab") as f:
+                    f.write(line + b"\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                _notify("save_failed", self.journal_path, str(e))
+                raise
+            merged = _with_session(self._data, day_key, session)
+            if merged is not self._data:
+                self._add_session_rollup(day_key, session.get("elapsed", 0))
+                _notify("focus_session_added", day_key)
+            self._data = merged
+            self._journal_count += 1
+            if not self.dirty:
+                self._stamp = self._file_stamp()
+            if self._checkpoint_timer is None:
+                self._checkpoint_timer = threading.Timer(CHECKPOINT_DELAY, _submit_flush, (self,))
+                self._checkpoint_timer.daemon = True
+                self._checkpoint_timer.start()
+            return self._data[day_key]
+
+    def flush(self):
+        # Flush = checkpoint: grava o histórico completo e tira do journal o que já entrou nele
+        with self._io_lock:
+            with self._lock:
+                for timer in (self._timer, self._checkpoint_timer):
+                    if timer is not None:
+                        timer.cancel()
+                self._timer = self._checkpoint_timer = None
+                if self._data is None or (not self.dirty and self._journal_count == 0):
+                    return
+                version = self._version
+                data = self._data
+                journal_size = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+
+            try:
+                self._persist(data)
+                with self._lock:
+                    self._journal_count = self._trim_journal(journal_size)
+                    self._flushed_version = version
+                    self._stamp = self._file_stamp()
+            except OSError as e:
+                # As sessões continuam no journal: não há o que desfazer, só avisar
+                print(f"Erro ao salvar {self.path}: {e}")
+                _notify("save_failed", self.path, str(e))
+
+    def _trim_journal(self, checkpointed_size):
+        # Mantém só o que foi anexado depois do snapshot que acabou de ir para o checkpoint
+        if not os.path.exists(self.journal_path):
+            return 0
+        with open(self.journal_path, "rb") as f:
+            f.seek(checkpointed_size)
+            tail = f.read()
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        return tail.count(b"\n")
+
+
+class SqliteFocusStore(SqliteStoreMixin, FocusRollupMixin, CachedJsonFile):
+    def __init__(self):
+        super().__init__(SQLITE_PATH, dict)
+        self._persisted = {}
+
+    def _parse(self):
+        with _db_lock:
+            history = sqlite_backend.load_focus_history(_db)
+            self.schema_version = self._load_schema_version("focus")
+        self._persisted = _clone(history)
+        return history
+
+    def _persist(self, data):
+        changed = {k: v for k, v in data.items() if self._persisted.get(k) != v}
+        removed = set(self._persisted) - set(data)
+        with _db_lock:
+            sqlite_backend.save_focus_days(_db, changed, removed)
+            self._save_schema_version("focus", self.schema_version)
+        self._persisted = data
+
+    def day(self, day_key):
+        self._fresh()
+        with _db_lock:
+            return sqlite_backend.focus_day(_db, day_key)
+
+    def append(self, day_key, session):
+        # No banco cada sessão já é uma linha: o append é um INSERT
+        self._fresh()
+        try:
+            with _db_lock:
+                sqlite_backend.add_focus_session(_db, day_key, session)
+        except sqlite3.Error as e:
+            _notify("save_failed", self.path, str(e))
+            raise
+        with self._lock:
+            if self._data is not None:
+                merged = _with_session(self._data, day_key, session)
+                if merged is not self._data:
+                    self._add_session_rollup(day_key, session.get("elapsed", 0))
+                self._data = self._persisted = merged
+        _notify("focus_session_added", day_key)
+        return self.day(day_key)
+
+
+class NotesStore(CachedJsonFile):
+    event = "notes_changed"
+
+    def __init__(self, path, default, **kwargs):
+        super().__init__(path, default, **kwargs)
+        self._views = ()
+
+    def _on_reload(self):
+        self._views = tuple(Note(n) for n in self._data.get("notes", []))
+        super()._on_reload()
+
+    def views(self):
+        self.read()
+        return self._views
+
+
+class SqliteNotesStore(SqliteStoreMixin, NotesStore):
+    def __init__(self):
+        super().__init__(SQLITE_PATH, lambda: {"notes": []})
+        self._persisted = {}
+
+    def _parse(self):
+        with _db_lock:
+            notes = sqlite_backend.load_notes(_db)
+            version = self._load_schema_version("notes")
+        self._persisted = {n["id"]: n for n in _clone(notes)}
+        return {"schema_version": version, "notes": notes}
+
+    def _persist(self, data):
+        notes = data.get("notes", [])
+        changed = [n for n in notes if self._persisted.get(n["id"]) != n]
+        removed = set(self._persisted) - {n["id"] for n in notes}
+        with _db_lock:
+            sqlite_backend.save_notes(_db, changed, removed)
+            self._save_schema_version("notes", data.get("schema_version", 0))
+        self._persisted = {n["id"]: n for n in notes}
+
 
 DEFAULT_CONFIG = {
     "categorias": {
@@ -59,56 +1102,84 @@ DEFAULT_CONFIG = {
     "gameplay": {
     "min_foco_para_sequencia_min": 10,
     "tolerancia_falha_dias": 0,
-    "xp_por_minuto_foco": 1
-  }
+    "xp_por_minuto_foco": 1,
+    # XP para passar do nível n ao n+1: int(base + n * por_nivel)
+    "curva_xp": {"base": 40, "por_nivel": 0.3},
+    # Nível mínimo de cada rank
+    "ranks": {"E": 0, "D": 10, "C": 20, "B": 30, "A": 40, "S": 50, "SS": 100, "SSS": 200, "X": 350}
+  },
+    "audio": {
+        "mudo": False,
+        "volume": 1.0
+    }
 }
 
-def incrementar_conclusao_missao(mission_id):
-    data = load_missions()
-    for mission in data.get("missions", []):
-        if mission.get("id") == mission_id:
-            # Se a chave não existir, ele começa em 1, se existir, soma +1
-            mission["completada_count"] = mission.get("completada_count", 0) + 1
-            break
-    save_missions_to_file(data)
+def _default_config():
+    return {"schema_version": SCHEMA_VERSIONS["config"], **_clone(DEFAULT_CONFIG)}
 
-def load_config():
-    if not os.path.exists(CONFIG_PATH):
-        save_config(DEFAULT_CONFIG)
-        return DEFAULT_CONFIG.copy()
 
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
+class ConfigStore(CachedJsonFile):
+    """config.json normalizado uma vez por mudança, com índice de categorias.
 
-    if "categorias" not in data:
-        data["categorias"] = {}
+    O índice aceita a chave ou o nome da categoria, sem diferenciar maiúsculas.
+    """
 
-    for key, cat in data["categorias"].items():
-        default_cat = DEFAULT_CONFIG["categorias"].get(key)
+    def __init__(self, path):
+        super().__init__(path, lambda: None)
+        # (config, visão somente leitura, índice de categorias), trocados juntos
+        self._state = (None, None, {})
 
-        if default_cat:
-            if "nome" not in cat:
-                cat["nome"] = default_cat["nome"]
-            if "cor" not in cat:
-                cat["cor"] = default_cat["cor"]
+    def _on_reload(self):
+        # A normalização acontece uma vez, na migração do startup. Pode rodar no
+        # io_worker enquanto a GUI lê: tudo é montado antes e publicado numa atribuição
+        old = self._state[0]
+        config = self._data if self._data is not None else _default_config()
+        categories = {}
+        for key, cat in config["categorias"].items():
+            view = types.MappingProxyType({**cat, "key": key})
+            for nome in (key, cat.get("nome", "")):
+                if nome:
+                    categories.setdefault(nome.lower(), view)
+        self._state = (config, types.MappingProxyType(config), categories)
+        if self._loaded and old is not None:
+            self._notify_changes(old, config)
 
-        if "pontos" not in cat:
-            cat["pontos"] = 0
-        if "ativa" not in cat:
-            cat["ativa"] = True
-    
-    if "gameplay" not in data:
-        data["gameplay"] = DEFAULT_CONFIG["gameplay"].copy()
+    @staticmethod
+    def _notify_changes(old, new):
+        # Um evento por categoria alterada; "" quando mudou algo fora das categorias
+        old_cats, new_cats = old.get("categorias", {}), new.get("categorias", {})
+        for key in set(old_cats) | set(new_cats):
+            if old_cats.get(key) != new_cats.get(key):
+                _notify("config_changed", key)
+        if {k: v for k, v in old.items() if k != "categorias"} != {k: v for k, v in new.items() if k != "categorias"}:
+            _notify("config_changed", "")
 
-    if "min_foco_para_sequencia_min" not in data["gameplay"]:
-        data["gameplay"]["min_foco_para_sequencia_min"] = 10
+    def config(self):
+        self.read()
+        return self._state[0]
 
-    save_config(data)
-    return data
+    def view(self):
+        self.read()
+        return self._state[1]
+
+    def category(self, categoria):
+        self.read()
+        return self._state[2].get((categoria or "").strip().lower())
+
+
+def get_config():
+    """Config normalizada em cache, numa visão somente leitura (use load_config para editar)."""
+    return _config_store.view()
+
+def get_category(categoria):
+    """Categoria pela chave ou pelo nome (com a chave em "key"), ou None."""
+    return _config_store.category(categoria)
+
+def load_config():
+    return _load_staged(_config_store, lambda: _clone(_config_store.config()))
 
 def save_config(data):
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    _save_staged(_config_store, data)
 
 def resource_path(relative_path):
     try:
@@ -118,14 +1189,256 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+_db_lock = threading.Lock()
+
+if USE_SQLITE:
+    _db = sqlite_backend.connect(SQLITE_PATH)
+    # O histórico de foco entra com o journal aplicado: sessões ainda sem checkpoint não se perdem
+    sqlite_backend.import_json_files(
+        _db, MISSIONS_DATA, lambda: _read_focus_files(FOCUS_DATA, FOCUS_JOURNAL)[0], NOTES_FILE
+    )
+    _mission_store = SqliteMissionStore()
+    _focus_store = SqliteFocusStore()
+    _notes_store = SqliteNotesStore()
+else:
+    _db = None
+    _mission_store = MissionStore(MISSIONS_DATA)
+    _focus_store = FocusHistoryStore(FOCUS_DATA, FOCUS_JOURNAL)
+    _notes_store = NotesStore(NOTES_FILE, lambda: {"notes": []}, tolerant=True)
+
+_user_store = CachedJsonFile(DATA_FILE, lambda: None, event="user_changed")
+_config_store = ConfigStore(CONFIG_PATH)
+
+
+def get_missions():
+    """Missões como visões somente leitura, sem reparsear o arquivo."""
+    return _mission_store.views()
+
+def get_mission(mission_id):
+    return _mission_store.get(mission_id)
+
+def missions_for_day(day, with_time=False):
+    """Missões (não apagadas) com prazo no dia ou cuja regra de repetição ocorre nele."""
+    return _mission_store.for_day(day, with_time)
+
+def missions_between(start, end):
+    """{dia: [missões]} para cada dia de start a end com alguma missão; não altera nenhuma."""
+    return _mission_store.between(start, end)
+
+def missions_by_tab(tipo):
+    return _mission_store.by_tab(tipo)
+
+def open_missions():
+    return _mission_store.open_missions()
+
 def load_missions():
-    if not os.path.exists(MISSIONS_DATA): return {"missions": []}
-    with open(MISSIONS_DATA, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # Cópia de trabalho: pode ser alterada e devolvida para save_missions_to_file
+    return _load_staged(_mission_store, lambda: _clone(_mission_store.read()))
 
 def save_missions_to_file(data):
-    with open(MISSIONS_DATA, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    _save_staged(_mission_store, data)
+
+# ---------- arquivo morto de missões ----------
+
+_archive_stores = {}
+
+def _archive_store(year):
+    store = _archive_stores.get(year)
+    if store is None:
+        path = os.path.join(ARCHIVE_DIR, f"missions_{year}.json.gz")
+        legacy = path[:-len(".gz")]
+        if os.path.exists(legacy) and not os.path.exists(path):
+            # Arquivo morto antigo, sem compressão: o GzipCodec lê e o próximo save comprime
+            os.replace(legacy, path)
+        store = _archive_stores[year] = CachedJsonFile(path, lambda: {"missions": []}, ARCHIVE_CODEC, tolerant=True)
+    return store
+
+def _archive_year(m, limite):
+    # Ano do arquivo para onde a missão vai, ou None se ela continua no missions.json
+    prazo = m.get("prazo") or ""
+    if m.get("status") == "deleted":
+        return prazo[:4] or str(datetime.date.today().year)
+    if m.get("status") != "Concluída" or rule_from_doc(m) is not None:
+        return None
+    # Conta do dia da conclusão: missão muito atrasada concluída hoje ainda fica
+    concluida = m.get("data_conclusao") or ""
+    if concluida and concluida < limite:
+        return (prazo or concluida)[:4]
+    return None
+
+def archive_missions(days=ARCHIVE_AFTER_DAYS):
+    """Grava em archive/missions_<ano>.json.gz as missões apagadas e as concluídas há mais de `days` dias.
+
+    Feito para o io_worker: só escreve o arquivo morto e devolve {id: missão}
+    arquivada; drop_archived tira essas missões do missions.json na GUI.
+    """
+    limite = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+    by_year = {}
+    for m in load_missions()["missions"]:
+        year = _archive_year(m, limite)
+        if year is not None:
+            by_year.setdefault(year, []).append(m)
+
+    if by_year:
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    archived = {}
+    for year, missions in by_year.items():
+        store = _archive_store(year)
+        ids = {m["id"] for m in missions}
+        kept = [m for m in store.read()["missions"] if m["id"] not in ids]
+        store.write({"schema_version": SCHEMA_VERSIONS["missions"], "missions": kept + missions})
+        # O arquivo morto vai para o disco antes: um crash no meio duplica, nunca perde
+        store.flush()
+        archived.update((m["id"], m) for m in missions)
+    return archived
+
+def drop_archived(archived):
+    """Tira do missions.json as missões de archive_missions que não mudaram desde então.
+
+    Uma missão alterada no meio fica (a cópia do arquivo morto é a velha).
+    Retorna quantas missões saíram do arquivo principal.
+    """
+    if not archived:
+        return 0
+    data = load_missions()
+    keep = [m for m in data["missions"] if archived.get(m["id"]) != m]
+    removed = len(data["missions"]) - len(keep)
+    if removed:
+        data["missions"] = keep
+        save_missions_to_file(data)
+    return removed
+
+def archive_years():
+    """Anos que têm missões arquivadas, do mais recente para o mais antigo."""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    years = []
+    for name in os.listdir(ARCHIVE_DIR):
+        if name.startswith("missions_") and name.endswith((".json", ".json.gz")):
+            years.append(name[len("missions_"):].split(".")[0])
+    return sorted(set(years), reverse=True)
+
+def archived_missions(year, offset=0, limit=50):
+    """Uma página das missões arquivadas em `year` (cópias)."""
+    missions = _archive_store(str(year)).read()["missions"]
+    return _clone(missions[offset:offset + limit])
+
+def archived_count(year):
+    return len(_archive_store(str(year)).read()["missions"])
+
+# ---------- sequências de id ----------
+
+class IdSequences:
+    """Contador persistido por tipo de registro ("missions", "notes").
+
+    Guarda o último id entregue; ids nunca voltam, nem depois que o registro
+    é apagado ou vai para o arquivo morto. A reserva é síncrona e em memória;
+    o contador vai para o disco pelo io_worker.
+    """
+
+    def __init__(self, path):
+        self._store = CachedJsonFile(path, dict)
+        self._lock = threading.Lock()
+        self._last = {}
+
+    def _load(self, kind):
+        return self._store.read().get(kind)
+
+    def _save(self, kind, value):
+        self._store.write({**self._store.read(), kind: value})
+        # Sem esperar o FLUSH_DELAY: o contador sai antes do arquivo que usa os ids
+        _submit_flush(self._store)
+
+    def reserve(self, kind, n=1):
+        """Reserva n ids seguidos com uma única gravação do contador."""
+        with self._lock:
+            last = self._last.get(kind)
+            if last is None:
+                stored = self._load(kind)
+                if stored is None:
+                    # Primeira vez (dados de antes das sequências): parte do maior id existente
+                    last = max(_SEQUENCE_SEEDS[kind](), default=0)
+                else:
+                    # Se um crash levou a última gravação do contador, os registros que
+                    # chegaram ao disco com ids maiores mandam
+                    last = max(stored, max(_LIVE_IDS[kind](), default=0))
+            self._last[kind] = last + n
+            self._save(kind, last + n)
+            return range(last + 1, last + n + 1)
+
+    def next(self, kind):
+        return self.reserve(kind)[0]
+
+
+class SqliteIdSequences(IdSequences):
+    """No banco os contadores ficam na tabela meta, como seq_<tipo>."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = {}
+        self._writes = PendingWrites(SQLITE_PATH, self._write_meta)
+
+    def _load(self, kind):
+        with _db_lock:
+            value = sqlite_backend.get_meta(_db, f"seq_{kind}")
+        return int(value) if value is not None else None
+
+    def _save(self, kind, value):
+        self._writes.add([(kind, value)])
+
+    def _write_meta(self, items):
+        # Só o último valor de cada contador importa
+        with _db_lock:
+            for kind, value in dict(items).items():
+                sqlite_backend.set_meta(_db, f"seq_{kind}", value)
+
+
+def _live_mission_ids():
+    return [m["id"] for m in _mission_store.views()]
+
+def _mission_ids():
+    ids = _live_mission_ids()
+    for year in archive_years():
+        ids.extend(m["id"] for m in _archive_store(year).read()["missions"])
+    return ids
+
+def _note_ids():
+    return [n["id"] for n in _notes_store.views()]
+
+_SEQUENCE_SEEDS = {"missions": _mission_ids, "notes": _note_ids}
+_LIVE_IDS = {"missions": _live_mission_ids, "notes": _note_ids}
+
+_sequences = SqliteIdSequences() if USE_SQLITE else IdSequences(SEQUENCES_FILE)
+
+def next_id(kind):
+    """Próximo id de "missions" ou "notes", em O(1). Um id entregue nunca é reutilizado."""
+    return _sequences.next(kind)
+
+def next_ids(kind, n):
+    """Bloco de n ids seguidos (range) para criações em lote: uma só gravação do contador."""
+    return _sequences.reserve(kind, n)
+
+def export_pretty(dest_dir):
+    """Exporta todos os dados como JSON indentado, para leitura humana. Retorna os arquivos gerados."""
+    documents = {
+        "missions.json": _mission_store.read(),
+        "focus_history.json": _focus_store.read(),
+        "notes.json": _notes_store.read(),
+        "config.json": _config_store.config(),
+    }
+    user = _user_store.read()
+    if user is not None:
+        documents["user.json"] = user
+    for year in archive_years():
+        documents[os.path.join("archive", f"missions_{year}.json")] = _archive_store(year).read()
+
+    written = []
+    for name, data in documents.items():
+        path = os.path.join(dest_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(path, PRETTY_CODEC.dumps(data))
+        written.append(path)
+    return written
 
 DEFAULT_USER_DATA = {
     "usuario": {
@@ -143,7 +1456,11 @@ DEFAULT_USER_DATA = {
     },
     "sequencia": {
         "missoes_consecutivas": 0,
-        "foco_consecutivo": 0
+        "foco_consecutivo": 0,
+        "missoes_melhor": 0,
+        "foco_melhor": 0,
+        "missoes_ultimo_dia": "",
+        "foco_ultimo_dia": ""
     },
     "foco": {
         "tempo_total_segundos": 0,
@@ -153,93 +1470,270 @@ DEFAULT_USER_DATA = {
 }
 
 def load_name():
-    if not os.path.exists(DATA_FILE): return None
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _user_store.read()
+        if data is None: return None
         return data.get("usuario", {}).get("nome")
     except: return None
 
 def save_name(nome):
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except: data = DEFAULT_USER_DATA.copy()
-    else:
-        data = DEFAULT_USER_DATA.copy()
+    try:
+        data = _user_store.read()
+    except: data = None
+    if data is None:
+        data = {"schema_version": SCHEMA_VERSIONS["user"], **DEFAULT_USER_DATA}
+    data = _clone(data)
 
     data["usuario"]["nome"] = nome
     
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    save_user(data)
 
 def load_focus_history():
-    if not os.path.exists(FOCUS_DATA): return {}
-    try:
-        with open(FOCUS_DATA, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception: return {}
+    return _clone(_focus_store.read())
 
 def save_focus_history(data):
-    with open(FOCUS_DATA, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    _focus_store.write(data)
+
+def add_focus_session(day_key, session):
+    """Registra uma sessão de foco (append no journal) e devolve o dia atualizado."""
+    return _clone(_focus_store.append(day_key, session))
+
+def focus_seconds(day_key):
+    """Segundos focados no dia (YYYY-MM-DD), direto do rollup."""
+    return _focus_store.rollups().days.get(day_key, 0)
+
+def focus_days():
+    """Segundos focados por dia (YYYY-MM-DD) de todo o histórico, direto do rollup (somente leitura)."""
+    return _focus_store.rollups().days
+
+def focus_totals(day=None):
+    """Totais de foco do dia, da semana ISO e do mês de `day` (hoje por padrão) e o total geral."""
+    day = day or datetime.date.today()
+    rollups = _focus_store.rollups()
+    return {
+        "day": rollups.days.get(day.isoformat(), 0),
+        "week": rollups.weeks.get(FocusRollups.week_key(day), 0),
+        "month": rollups.months.get(day.strftime("%Y-%m"), 0),
+        "all_time": rollups.total,
+    }
+
+def focus_sessions(day_key):
+    """Sessões do dia como modelos Session, com início e fim já convertidos para datetime."""
+    day = _focus_store.day(day_key)
+    return tuple(Session(s) for s in day["sessions"]) if day else ()
+
+def get_focus_day(day_key):
+    day = _focus_store.day(day_key)
+    return _clone(day) if day else {"total_seconds": 0, "sessions": []}
+
+def _read_user():
+    data = _user_store.read()
+    if data is None:
+        raise FileNotFoundError(DATA_FILE)
+    return _clone(data)
 
 def load_user():
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load_staged(_user_store, _read_user)
 
 def save_user(data):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    _save_staged(_user_store, data)
 
-def load_notes():
-    if not os.path.exists(NOTES_FILE):
-        return {"notes": []}
+def _write_ledger(events):
+    payload = b"".join(DEFAULT_CODEC.dumps(e) + b"\n" for e in events)
+    with open(LEDGER_FILE, "ab+") as f:
+        # Uma linha cortada por crash não pode colar no primeiro evento novo
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                payload = b"\n" + payload
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
 
-    try:
-        with open(NOTES_FILE, "r", encoding="utf-8") as f:
-            data = f.read().strip()
+_ledger_writes = PendingWrites(LEDGER_FILE, _write_ledger)
 
-            if not data:
-                return {"notes": []}
+def append_ledger(events):
+    """Acrescenta eventos ao ledger.jsonl (só append); o io_worker grava, com fsync, em ordem."""
+    _ledger_writes.add(events)
 
-            return json.loads(data)
+def read_ledger():
+    """Eventos do ledger em ordem, incluindo os que ainda estão na fila de gravação."""
+    # Tamanho do arquivo e fila lidos juntos: um flush no meio não duplica nem pula eventos
+    with _ledger_writes._io_lock:
+        size = os.path.getsize(LEDGER_FILE) if os.path.exists(LEDGER_FILE) else 0
+        pending = _ledger_writes.pending()
+    if size:
+        with open(LEDGER_FILE, "rb") as f:
+            while f.tell() < size:
+                line = f.readline()
+                if not line.strip():
+                    continue
+                try:
+                    yield DEFAULT_CODEC.loads(line)
+                except ValueError:
+                    # Linha cortada por um crash durante o append
+                    continue
+    yield from pending
 
-    except json.JSONDecodeError:
-        return {"notes": []}
+def get_notes():
+    """Notas como modelos somente leitura (Note)."""
+    return _notes_store.views()
+
+def load_notes():
+    return _clone(_notes_store.read())
 
 
 def save_notes(data):
-    with open(NOTES_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    _notes_store.write(data)
 
-def verificar_sequencia_foco():
-    try:
-        user = load_user()
-        config = load_config()
-        history = load_focus_history()
-
-        hoje = datetime.date.today().isoformat()
-        ontem = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
-
-        limite_minutos = config.get("gameplay", {}).get("min_foco_para_sequencia_min", 10)
-        
-        tempo_hoje_min = history.get(hoje, {}).get("total_seconds", 0) / 60
-
-        # Se atingiu o tempo mínimo e ainda não foi contabilizado hoje
-        if tempo_hoje_min >= limite_minutos:
-            if user["foco"].get("ultima_data_streak") != hoje:
-                # Se focou ontem, soma. Se não, reseta para 1.
-                tempo_ontem_min = history.get(ontem, {}).get("total_seconds", 0) / 60
-                if tempo_ontem_min >= limite_minutos:
-                    user["sequencia"]["foco_consecutivo"] += 1
-                else:
-                    user["sequencia"]["foco_consecutivo"] = 1
-                
-                user["foco"]["ultima_data_streak"] = hoje
-        
-        user["foco"]["ultima_data"] = hoje
-        save_user(user)
-    except Exception as e:
-        print(f"Erro streak: {e}")
\ No newline at end of file
+# ---------- migrações de schema ----------
+# Cada arquivo guarda "schema_version"; as etapas rodam uma vez no startup e daí em
+# diante os caminhos de leitura assumem o formato normalizado.
+
+def _missions_v1(data):
+    defaults = {
+        "status": "Pendente", "xp": 10, "categoria": None, "prazo": None, "descricao": "",
+        "horario_inicio": None, "horario_fim": None, "tipo": "DIÁRIAS",
+    }
+    missions = []
+    for m in data.get("missions", []):
+        m = dict(m)
+        for key, value in defaults.items():
+            m.setdefault(key, value)
+        repet = [bool(r) for r in (m.get("repetida") or [])][:7]
+        m["repetida"] = repet + [False] * (7 - len(repet))
+        missions.append(m)
+    return {**data, "missions": missions}
+
+def _missions_v2(data):
+    # Data da conclusão para o arquivo morto: a da última conclusão no ledger ou,
+    # sem registro, hoje (a missão só sai do missions.json daqui a ARCHIVE_AFTER_DAYS)
+    concluidas = {}
+    for event in read_ledger():
+        if event.get("tipo") == "conclusao":
+            concluidas[event["missao"]] = event["data"]
+        elif event.get("tipo") == "reabertura":
+            concluidas.pop(event["missao"], None)
+    today = datetime.date.today().isoformat()
+    missions = []
+    for m in data.get("missions", []):
+        if m.get("status") == "Concluída" and not m.get("data_conclusao"):
+            m = {**m, "data_conclusao": concluidas.get(m["id"], today)}
+        missions.append(m)
+    return {**data, "missions": missions}
+
+def _config_v1(data):
+    data = _clone(data)
+
+    if "categorias" not in data:
+        data["categorias"] = {}
+
+    for key, cat in data["categorias"].items():
+        default_cat = DEFAULT_CONFIG["categorias"].get(key)
+
+        if default_cat:
+            if "nome" not in cat:
+                cat["nome"] = default_cat["nome"]
+            if "cor" not in cat:
+                cat["cor"] = default_cat["cor"]
+
+        if "pontos" not in cat:
+            cat["pontos"] = 0
+        if "ativa" not in cat:
+            cat["ativa"] = True
+    
+    if "gameplay" not in data:
+        data["gameplay"] = _clone(DEFAULT_CONFIG["gameplay"])
+
+    for key, value in DEFAULT_CONFIG["gameplay"].items():
+        data["gameplay"].setdefault(key, _clone(value))
+
+    return data
+
+def _config_v2(data):
+    # Curva de XP e ranks configuráveis
+    data = _clone(data)
+    gameplay = data.setdefault("gameplay", {})
+    for key in ("curva_xp", "ranks"):
+        gameplay.setdefault(key, _clone(DEFAULT_CONFIG["gameplay"][key]))
+    return data
+
+def _config_v3(data):
+    data = _clone(data)
+    audio = data.setdefault("audio", {})
+    for key, value in DEFAULT_CONFIG["audio"].items():
+        audio.setdefault(key, value)
+    return data
+
+def _user_v1(data):
+    data = _clone(data)
+    for section, defaults in DEFAULT_USER_DATA.items():
+        target = data.setdefault(section, {})
+        for key, value in defaults.items():
+            target.setdefault(key, _clone(value))
+    data["foco"].setdefault("ultima_data_streak", "")
+    return data
+
+def _user_v2(data):
+    # Sequências com recorde e último dia que contou (antes só o foco guardava o dia)
+    data = _clone(data)
+    seq = data.setdefault("sequencia", {})
+    for kind, atual in (("missoes", "missoes_consecutivas"), ("foco", "foco_consecutivo")):
+        seq.setdefault(atual, 0)
+        seq.setdefault(f"{kind}_melhor", seq[atual])
+        seq.setdefault(f"{kind}_ultimo_dia", "")
+    if not seq["foco_ultimo_dia"]:
+        seq["foco_ultimo_dia"] = data.get("foco", {}).get("ultima_data_streak", "")
+    return data
+
+def _notes_v1(data):
+    defaults = {"title": "", "text": "", "color": "#1e1b2e", "pinned": False}
+    return {**data, "notes": [{**n, **{k: v for k, v in defaults.items() if k not in n}} for n in data.get("notes", [])]}
+
+def _focus_v1(history):
+    # Recalcula os totais a partir das sessões (arquivos antigos podiam divergir)
+    fixed = {}
+    for day_key, info in history.items():
+        sessions = info.get("sessions", [])
+        fixed[day_key] = {**info, "sessions": sessions, "total_seconds": sum(s.get("elapsed", 0) for s in sessions)}
+    return fixed
+
+MIGRATIONS = {
+    "missions": [_missions_v1, _missions_v2],
+    "config": [_config_v1, _config_v2, _config_v3],
+    "user": [_user_v1, _user_v2],
+    "notes": [_notes_v1],
+    "focus": [_focus_v1],
+}
+SCHEMA_VERSIONS = {kind: len(steps) for kind, steps in MIGRATIONS.items()}
+
+def _upgrade(kind, data, version):
+    for step in MIGRATIONS[kind][version:]:
+        data = step(data)
+    return data
+
+def _read_raw(store):
+    # Lê sem passar pelo cache: os índices dos stores já assumem o formato migrado
+    return store._parse() if store._file_stamp() else store.default()
+
+def migrate_data():
+    """Leva todos os arquivos de dados para o schema atual. Retorna os tipos migrados."""
+    migrated = []
+    for kind, store in (("missions", _mission_store), ("config", _config_store),
+                        ("user", _user_store), ("notes", _notes_store)):
+        data = _read_raw(store)
+        if data is None or data.get("schema_version", 0) >= SCHEMA_VERSIONS[kind]:
+            continue
+        data = _upgrade(kind, data, data.get("schema_version", 0))
+        store.write({**data, "schema_version": SCHEMA_VERSIONS[kind]})
+        store.flush()
+        migrated.append(kind)
+
+    history = _read_raw(_focus_store)
+    if _focus_store.schema_version < SCHEMA_VERSIONS["focus"]:
+        history = _upgrade("focus", history, _focus_store.schema_version)
+        _focus_store.schema_version = SCHEMA_VERSIONS["focus"]
+        _focus_store.write(history)
+        _focus_store.flush()
+        migrated.append("focus")
+    return migrated
@@ -0,0 +1,109 @@
+import os
+
+from PySide6 import QtCore
+
+import data_manager
+from io_worker import worker
+
+
+class EventBus(QtCore.QObject):
+    """Sinais de mudança dos dados, emitidos pelo data_manager.
+
+    As notificações chegam de dentro dos stores (às vezes de outra thread) e são
+    reemitidas no loop da GUI, depois que o store já liberou o lock.
+    """
+
+    mission_changed = QtCore.Signal(int)
+    mission_added = QtCore.Signal(int)
+    mission_removed = QtCore.Signal(int)
+    focus_session_added = QtCore.Signal(str)
+    user_changed = QtCore.Signal()
+    config_changed = QtCore.Signal(str)
+    notes_changed = QtCore.Signal()
+    # Emitido pelo rollover.RolloverTimer depois da virada de dia
+    day_changed = QtCore.Signal(str)
+    # Gravação que falhou no io_worker (caminho, erro); o cache já voltou ao estado do disco
+    save_failed = QtCore.Signal(str, str)
+
+    _queued = QtCore.Signal(str, object)
+
+    WATCH_DEBOUNCE_MS = 300
+
+    def __init__(self):
+        super().__init__()
+        self._queued.connect(self._deliver, QtCore.Qt.QueuedConnection)
+        data_manager.add_listener(self._on_data_event)
+        self._watcher = None
+        self._watch_timer = None
+
+    def _on_data_event(self, event, *args):
+        self._queued.emit(event, args)
+
+    def _deliver(self, event, args):
+        getattr(self, event).emit(*args)
+
+    def connect_missions(self, slot):
+        for signal in (self.mission_changed, self.mission_added, self.mission_removed):
+            signal.connect(slot)
+
+    # ---------- mudanças feitas fora do app ----------
+    def watch(self, directory):
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watch_timer = QtCore.QTimer(self)
+        self._watch_timer.setSingleShot(True)
+        self._watch_timer.setInterval(self.WATCH_DEBOUNCE_MS)
+        self._watch_timer.timeout.connect(self._check_files)
+
+        self._watcher.directoryChanged.connect(self._watch_timer.start)
+        self._watcher.fileChanged.connect(self._watch_timer.start)
+        self._watcher.addPath(directory)
+        self._watch_files(directory)
+
+    def _watch_files(self, directory):
+        # Saves atômicos trocam o arquivo: o watcher perde o caminho e precisa dele de novo
+        files = [os.path.join(directory, n) for n in os.listdir(directory) if not n.endswith(".tmp")]
+        missing = [f for f in files if os.path.isfile(f) and f not in self._watcher.files()]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _check_files(self):
+        for directory in self._watcher.directories():
+            self._watch_files(directory)
+        # Reler e parsear arquivos grandes fica fora da thread da GUI
+        worker.submit(data_manager.check_external_changes)
+
+
+class DeferredRefresh(QtCore.QObject):
+    """Roda `callback` uma vez por rajada de eventos, e só quando o widget está visível.
+
+    Se o widget estiver escondido, a atualização fica pendente até o próximo showEvent.
+    """
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.widget = widget
+        self.callback = callback
+        self._pending = False
+        self._scheduled = False
+        widget.installEventFilter(self)
+
+    def request(self, *args):
+        self._pending = True
+        if self.widget.isVisible() and not self._scheduled:
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self._run)
+
+    def _run(self):
+        self._scheduled = False
+        if self._pending and self.widget.isVisible():
+            self._pending = False
+            self.callback()
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QtCore.QEvent.Show and self._pending:
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self._run)
+        return False
+
+
+bus = EventBus()
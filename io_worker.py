@@ -0,0 +1,83 @@
+import threading
+
+from PySide6 import QtCore
+
+import data_manager
+
+
+class _Task(QtCore.QRunnable):
+    def __init__(self, worker, fn, args, on_done, on_error):
+        super().__init__()
+        self.worker = worker
+        self.fn = fn
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.worker._finished.emit(self.on_error, e)
+        else:
+            self.worker._finished.emit(self.on_done, result)
+
+
+class _FlushTask(QtCore.QRunnable):
+    def __init__(self, worker, store):
+        super().__init__()
+        self.worker = worker
+        self.store = store
+
+    def run(self):
+        with self.worker._lock:
+            self.worker._queued.discard(self.store)
+        # Erros de gravação o próprio store trata: desfaz o cache e avisa com save_failed
+        self.store.flush()
+
+
+class IoWorker(QtCore.QObject):
+    """Dono do I/O de arquivos: flushes e tarefas pesadas rodam num QThreadPool.
+
+    Cada store tem no máximo um flush na fila; como o flush grava a versão mais
+    nova e segura o _io_lock do store, as gravações de um mesmo arquivo saem em
+    ordem. Os callbacks de submit voltam na thread da GUI.
+    """
+
+    MAX_THREADS = 2
+
+    _finished = QtCore.Signal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._finished.connect(self._deliver, QtCore.Qt.QueuedConnection)
+        data_manager.set_flush_executor(self.flush_store)
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Roda fn(*args) no pool; on_done(resultado) ou on_error(exceção) voltam na GUI."""
+        self.pool.start(_Task(self, fn, args, on_done, on_error))
+
+    def flush_store(self, store):
+        with self._lock:
+            if store in self._queued:
+                return
+            self._queued.add(store)
+        self.pool.start(_FlushTask(self, store))
+
+    def _deliver(self, callback, value):
+        if callback is not None:
+            callback(value)
+        elif isinstance(value, Exception):
+            print(f"Erro no io_worker: {value}")
+
+    def shutdown(self):
+        # Espera o que já está na fila e grava o que ainda estiver pendente
+        self.pool.waitForDone()
+        data_manager.flush_all()
+
+
+worker = IoWorker()
@@ -0,0 +1,180 @@
+"""Ledger de XP: conclusões, reaberturas e pontos gastos como eventos só de append.
+
+Nível, xp e pontos do usuário, os pontos das categorias e o completada_count das
+missões saem dele. LedgerTotals soma cada evento novo; rebuild() refaz tudo
+relendo o ledger numa passada. user.json, config.json e missions.json guardam
+só a projeção desses totais.
+"""
+import datetime
+
+from data_manager import (
+    append_ledger, read_ledger, get_category, load_user, save_user, load_config, save_config,
+    load_missions, save_missions_to_file, transaction
+)
+from progression import add_xp_to_user, xp_table
+
+
+class LedgerTotals:
+    """Agregados do ledger, atualizados evento a evento."""
+
+    def __init__(self):
+        self.usuario = {"nivel": 0, "xp": 0, "pontos_disponiveis": 0}
+        self.categorias = {}
+        self.completadas = {}
+        # missão -> (xp, categoria, dia) da última conclusão ainda não desfeita
+        self.concedido = {}
+        # dia -> conclusões que continuam valendo
+        self.dias = {}
+        self.count = 0
+        self.table = xp_table()
+
+    def apply(self, event):
+        tipo = event["tipo"]
+        categoria = event.get("categoria")
+
+        if tipo == "abertura":
+            # Saldo inicial: o estado dos arquivos quando o ledger foi criado
+            self.usuario = dict(event["usuario"])
+            self.categorias = dict(event["categorias"])
+            self.completadas = {int(k): v for k, v in event["completadas"].items()}
+        elif tipo == "conclusao":
+            mission_id = event["missao"]
+            add_xp_to_user({"usuario": self.usuario}, event["xp"], self.table)
+            self.completadas[mission_id] = self.completadas.get(mission_id, 0) + 1
+            self.concedido[mission_id] = (event["xp"], categoria, event["data"])
+            self.dias[event["data"]] = self.dias.get(event["data"], 0) + 1
+            if categoria:
+                self.categorias[categoria] = self.categorias.get(categoria, 0) + 1
+        elif tipo == "reabertura":
+            add_xp_to_user({"usuario": self.usuario}, -event["xp"], self.table)
+            self.concedido.pop(event["missao"], None)
+            dia = event.get("data_conclusao")
+            if dia in self.dias:
+                self.dias[dia] -= 1
+            if categoria:
+                self.categorias[categoria] = max(0, self.categorias.get(categoria, 0) - 1)
+        elif tipo == "ponto":
+            self.usuario["pontos_disponiveis"] = max(0, self.usuario["pontos_disponiveis"] - 1)
+            self.categorias[categoria] = self.categorias.get(categoria, 0) + 1
+
+        self.count += 1
+
+
+def replay(events):
+    totals = LedgerTotals()
+    for event in events:
+        totals.apply(event)
+    return totals
+
+
+_totals = None
+
+def totals():
+    """Agregados atuais; o ledger só é relido na primeira chamada (ou se a curva de XP mudar)."""
+    global _totals
+    if _totals is None or _totals.table is not xp_table():
+        t = replay(read_ledger())
+        if not t.count:
+            opening = _opening_balance()
+            append_ledger([opening])
+            t.apply(opening)
+        _totals = t
+    return _totals
+
+
+def _today():
+    return datetime.date.today().isoformat()
+
+def _category_key(categoria):
+    cat = get_category(categoria)
+    return cat["key"] if cat else None
+
+def _opening_balance():
+    user = load_user()["usuario"]
+    return {
+        "tipo": "abertura",
+        "data": _today(),
+        "usuario": {k: user.get(k, 0) for k in ("nivel", "xp", "pontos_disponiveis")},
+        "categorias": {key: cat.get("pontos", 0) for key, cat in load_config()["categorias"].items()},
+        "completadas": {str(m["id"]): m["completada_count"]
+                        for m in load_missions()["missions"] if m.get("completada_count")},
+    }
+
+
+def completion(mission, xp):
+    return {"tipo": "conclusao", "missao": mission["id"], "data": _today(), "xp": xp,
+            "categoria": _category_key(mission["categoria"])}
+
+def reopening(mission, fallback_xp):
+    """Desfaz a última conclusão com o XP que ela de fato deu.
+
+    `fallback_xp` só vale para missões concluídas antes do ledger existir.
+    """
+    xp, categoria, dia = totals().concedido.get(mission["id"], (fallback_xp, _category_key(mission["categoria"]), None))
+    return {"tipo": "reabertura", "missao": mission["id"], "data": _today(), "xp": xp, "categoria": categoria,
+            "data_conclusao": dia}
+
+def point_spent(key):
+    return {"tipo": "ponto", "data": _today(), "categoria": key}
+
+
+def record(events):
+    """Soma os eventos aos totais e projeta-os na transação. Devolve o usuário derivado.
+
+    Os eventos só vão para o ledger no commit; se a transação falhar, os totais
+    em memória são descartados e relidos do ledger na próxima consulta.
+    """
+    t = totals()
+    for event in events:
+        t.apply(event)
+    with transaction() as tx:
+        tx.on_commit(lambda: append_ledger(events))
+        tx.on_rollback(_discard_totals)
+        _project(t, {e["categoria"] for e in events}, {e["missao"] for e in events if "missao" in e})
+    return dict(t.usuario)
+
+
+def _discard_totals():
+    global _totals
+    _totals = None
+
+
+def rebuild():
+    """Refaz os agregados relendo o ledger inteiro e regrava todas as projeções."""
+    _discard_totals()
+    t = totals()
+    with transaction():
+        _project(t)
+    return t
+
+
+def _project(t, categorias=None, missoes=None):
+    # None = projeta tudo (rebuild); senão só as categorias e missões tocadas
+    user_data = load_user()
+    if any(user_data["usuario"].get(k) != v for k, v in t.usuario.items()):
+        user_data["usuario"].update(t.usuario)
+        save_user(user_data)
+
+    config = load_config()
+    changed = False
+    for key, cat in config["categorias"].items():
+        if categorias is not None and key not in categorias:
+            continue
+        pontos = t.categorias.get(key, 0)
+        if cat.get("pontos") != pontos:
+            cat["pontos"] = pontos
+            changed = True
+    if changed:
+        save_config(config)
+
+    data = load_missions()
+    changed = False
+    for m in data["missions"]:
+        if missoes is not None and m["id"] not in missoes:
+            continue
+        count = t.completadas.get(m["id"], 0)
+        if m.get("completada_count", 0) != count:
+            m["completada_count"] = count
+            changed = True
+    if changed:
+        save_missions_to_file(data)
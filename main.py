@@ -2,7 +2,10 @@ import os, sys, winreg
 import ctypes
 from PySide6 import QtCore, QtWidgets, QtGui
 from PySide6.QtWidgets import QSystemTrayIcon, QMenu
-from data_manager import load_name, resource_path
+from data_manager import load_name, resource_path, DATA_DIR
+from event_bus import bus
+from io_worker import worker
+from sound_manager import sounds
 from screens.mission_screen import MissionScreen
 from screens.focus_screen import FocusScreen
 from screens.home_screen import HomeScreen
@@ -12,8 +15,10 @@ from screens.loading_screen import LoadingScreen
 from screens.planner_screen import PlannerScreen
 from screens.name_screen import NameScreen 
 from screens.config_screen import ConfigScreen 
-from data_manager import load_user
+from data_manager import load_user, archive_missions, drop_archived, migrate_data
 from progression import xp_needed_for_level, get_rank
+from rollover import roll_over, RolloverTimer
+import streaks
 from widgets.detail_mission_modal import DetailsMissionModal
 from widgets.edit_modal import EditMissionModal
 from data_manager import load_missions
@@ -361,19 +366,20 @@ class MainWindow(QtWidgets.QWidget):
         
         self.screen_home = HomeScreen()
         self.screen_missions = MissionScreen(self)
-        self.screen_missions.mission_completed.connect(
-            self.screen_home.refresh
-        )
         self.screen_missions.mission_clicked.connect(self.abrir_detalhes_missao)
         self.screen_planner = PlannerScreen(self)
         self.screen_focus = FocusScreen(self)
-        self.screen_focus.foco_finalizado.connect(self.screen_home.refresh)
         self.screen_name = NameScreen(self) 
         self.screen_notes = NotesScreen(self) 
         self.screen_config = ConfigScreen(self)
         self.overlay = self.menu.timer_widget 
         self.screen_focus.time_updated.connect(self.manage_overlay)
-        self.screen_missions.mission_completed.connect(self.screen_planner.load_all)
+
+        # As telas se atualizam pelos sinais do bus; o watcher pega edições feitas fora do app
+        bus.user_changed.connect(self.menu.refresh_profile)
+        bus.save_failed.connect(self.warn_save_failed)
+        bus.watch(DATA_DIR)
+        self.rollover_timer = RolloverTimer(self)
 
 
         self.stack = QtWidgets.QStackedWidget()
@@ -402,7 +408,7 @@ class MainWindow(QtWidgets.QWidget):
         sair = menu.addAction("Sair")
 
         abrir.triggered.connect(self.show_window)
-        sair.triggered.connect(QtWidgets.QApplication.quit)
+        sair.triggered.connect(self.quit_app)
 
         self.tray.setContextMenu(menu)
         self.tray.activated.connect(self.tray_clicked)
@@ -420,6 +426,7 @@ class MainWindow(QtWidgets.QWidget):
     
     def abrir_editor_missao(self, mission_data):
         editor = EditMissionModal(mission_data, self)
+        self.editing_mission_id = mission_data["id"]
         
         # Conecta os sinais do editor para atualizar a interface
         editor.accepted.connect(self.salvar_e_atualizar)
@@ -428,25 +435,17 @@ class MainWindow(QtWidgets.QWidget):
         editor.exec()
 
     def salvar_e_atualizar(self, novo_data):
-        # Aqui você chamaria sua função de salvar no data_manager
-        # e depois daria um refresh nas telas
-        self.screen_missions.load_all()
-        self.screen_home.refresh()
-        self.screen_planner.load_all()
+        # O refresh das telas vem dos sinais do bus
+        self.screen_missions.save_edit(self.editing_mission_id, novo_data)
     
     def excluir_e_atualizar(self, mission_id):
-        # Lógica de exclusão e refresh
-        self.screen_missions.load_all()
-        self.screen_home.refresh()
+        self.screen_missions.delete_mission(mission_id)
 
     def change(self, i):
         target_index = i + 1
 
         if target_index < self.stack.count():
 
-            if target_index == 1:
-                self.screen_home.refresh()
-
             self.stack.setCurrentIndex(target_index)
 
             if i < len(self.menu.buttons):
@@ -464,7 +463,21 @@ class MainWindow(QtWidgets.QWidget):
         self.raise_()
         self.activateWindow()
 
+    def warn_save_failed(self, path, error):
+        self.tray.showMessage(
+            "LevelUp",
+            f"Não foi possível salvar {os.path.basename(path)}.",
+            QSystemTrayIcon.Warning,
+            4000
+        )
+
+    def quit_app(self):
+        worker.shutdown()
+        QtWidgets.QApplication.quit()
+
     def closeEvent(self, event):
+        worker.shutdown()
+
         if DEV_MODE:
             event.accept()   # fecha direto (modo dev)
             return
@@ -548,10 +561,17 @@ if __name__ == "__main__":
     app_icon = QtGui.QIcon(resource_path("images/icone.ico"))
     app.setWindowIcon(app_icon)
 
+    if "user" in migrate_data():
+        # Sequências com recorde e tolerância: refeitas uma vez a partir do histórico
+        streaks.recompute_all()
+    roll_over()
+
     loading = LoadingScreen()
     window = MainWindow()
 
     def start_main():
+        # O arquivo morto é escrito pelo io_worker; a limpeza do missions.json volta para a GUI
+        worker.submit(archive_missions, on_done=drop_archived)
         loading.close()
 
         window.screen_home.refresh()
@@ -560,6 +580,8 @@ if __name__ == "__main__":
         window.menu.refresh_profile()
 
         window.show() 
+        # Os sons carregam depois que a janela já está na tela
+        QtCore.QTimer.singleShot(0, sounds.preload)
 
     loading.finished.connect(start_main)
 
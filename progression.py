@@ -1,43 +1,90 @@
+import bisect
+
+from data_manager import DEFAULT_CONFIG, get_config
+
+
+class XpTable:
+    """XP acumulado para chegar a cada nível: cum[n] é o total do nível 0 até n.
+
+    Estendida sob demanda; nível por XP total sai de uma busca binária.
+    """
+
+    def __init__(self, base, por_nivel):
+        self.base = base
+        self.por_nivel = por_nivel
+        self.cum = [0]
+
+    def needed(self, level):
+        return max(1, int(self.base + level * self.por_nivel))
+
+    def total_at(self, level):
+        cum = self.cum
+        while len(cum) <= level:
+            cum.append(cum[-1] + self.needed(len(cum) - 1))
+        return cum[level]
+
+    def level_for(self, total):
+        """Maior nível cujo acumulado é <= total (-1 se total < 0)."""
+        cum = self.cum
+        while cum[-1] <= total:
+            self.total_at(2 * len(cum))
+        return bisect.bisect_right(cum, total) - 1
+
+
+_table = None
+_ranks = (None, [], [])
+
+def _gameplay():
+    return get_config().get("gameplay", {})
+
+def xp_table():
+    """Tabela da curva configurada; refeita só quando a curva muda."""
+    global _table
+    curve = {**DEFAULT_CONFIG["gameplay"]["curva_xp"], **_gameplay().get("curva_xp", {})}
+    if _table is None or (_table.base, _table.por_nivel) != (curve["base"], curve["por_nivel"]):
+        _table = XpTable(curve["base"], curve["por_nivel"])
+    return _table
+
+
 def xp_needed_for_level(level):
-    return int(40 + (level * 0.3))
+    return xp_table().needed(level)
 
 
-def add_xp_to_user(user_data, amount):
-    user = user_data["usuario"]
+def total_xp(user, table=None):
+    """XP total acumulado de `user` (a seção "usuario")."""
+    return (table or xp_table()).total_at(max(0, user["nivel"])) + user["xp"]
+
 
-    user["xp"] += amount
+def level_for_xp(total, floor=1, table=None):
+    """(nível, xp dentro do nível) para um XP total, sem descer abaixo de `floor`."""
+    table = table or xp_table()
+    level = max(floor, table.level_for(total))
+    return level, max(0, total - table.total_at(level))
 
-    while user["xp"] >= xp_needed_for_level(user["nivel"]):
-        user["xp"] -= xp_needed_for_level(user["nivel"])
-        user["nivel"] += 1
-        user["pontos_disponiveis"] += 1
 
-    while user["xp"] < 0 and user["nivel"] > 1:
-        user["nivel"] -= 1
-        user["xp"] += xp_needed_for_level(user["nivel"])
-        user["pontos_disponiveis"] = max(0, user["pontos_disponiveis"] - 1)
+def add_xp_to_user(user_data, amount, table=None):
+    # `table` evita reler a config a cada chamada quando muitas são feitas em sequência
+    user = user_data["usuario"]
+    old_level = max(0, user["nivel"])
+    table = table or xp_table()
+
+    level, xp = level_for_xp(total_xp(user, table) + amount, min(old_level, 1), table)
+    user["nivel"] = level
+    user["xp"] = xp
 
-    if user["xp"] < 0:
-        user["xp"] = 0
+    if level > old_level:
+        user["pontos_disponiveis"] += level - old_level
+    elif level < old_level:
+        user["pontos_disponiveis"] = max(0, user["pontos_disponiveis"] - (old_level - level))
 
     return user_data
 
 def get_rank(level):
-    if level >= 350:
-        return "X"
-    elif level >= 200:
-        return "SSS"
-    elif level >= 100:
-        return "SS"
-    elif level >= 50:
-        return "S"
-    elif level >= 40:
-        return "A"
-    elif level >= 30:
-        return "B"
-    elif level >= 20:
-        return "C"
-    elif level >= 10:
-        return "D"
-    else:
-        return "E"
+    global _ranks
+    ranks = _gameplay().get("ranks") or DEFAULT_CONFIG["gameplay"]["ranks"]
+    if ranks is not _ranks[0]:
+        ordered = sorted(ranks.items(), key=lambda item: item[1])
+        _ranks = (ranks, [nivel for _, nivel in ordered], [nome for nome, _ in ordered])
+    _, thresholds, names = _ranks
+    i = bisect.bisect_right(thresholds, level) - 1
+    return names[max(0, i)]
@@ -0,0 +1,125 @@
+"""Regras de recorrência das missões e expansão das ocorrências num intervalo de datas.
+
+A regra sai de mission["recorrencia"] ou, nas missões que só têm a lista
+"repetida", vira uma máscara semanal sem fim. Nada aqui altera a missão: as
+telas perguntam se ela ocorre num dia ou quais são as ocorrências de uma janela.
+
+    "recorrencia": {"tipo": "semanal", "fim": "2026-12-31"}  (dias em "repetida")
+    "recorrencia": {"tipo": "a_cada", "intervalo": 3, "inicio": "2026-01-05"}
+    "recorrencia": {"tipo": "mensal", "dia": 31}  (meses curtos: último dia)
+"""
+import calendar
+import collections
+import datetime
+import functools
+
+WEEKLY = "semanal"
+EVERY_N_DAYS = "a_cada"
+MONTHLY = "mensal"
+KINDS = (WEEKLY, EVERY_N_DAYS, MONTHLY)
+
+# Bit do repeat_mask (SQLite) das regras que não são só uma máscara semanal:
+# marca a missão como candidata em qualquer dia, e o filtro fino é occurs_on
+OTHER_RULE_BIT = 1 << 7
+
+Rule = collections.namedtuple("Rule", "kind mask interval day start end")
+
+
+def _date(value):
+    try:
+        return datetime.date.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def weekly_mask(repetida):
+    mask = 0
+    for weekday, ativo in enumerate(repetida or ()):
+        if ativo:
+            mask |= 1 << weekday
+    return mask
+
+
+def rule_from_doc(doc):
+    """Regra da missão (Rule, imutável e usável como chave de cache) ou None se não repete."""
+    rec = doc.get("recorrencia") or {}
+    kind = rec.get("tipo", WEEKLY)
+    start, end = _date(rec.get("inicio")), _date(rec.get("fim"))
+
+    if kind == EVERY_N_DAYS:
+        interval = max(1, int(rec.get("intervalo") or 1))
+        # Sem início explícito, conta a partir do prazo (ou da criação)
+        start = start or _date(doc.get("prazo")) or _date(doc.get("data_criacao"))
+        if start is None:
+            return None
+        return Rule(EVERY_N_DAYS, 0, interval, 0, start, end)
+    if kind == MONTHLY:
+        day = min(31, max(1, int(rec.get("dia") or 1)))
+        return Rule(MONTHLY, 0, 1, day, start, end)
+
+    mask = weekly_mask(doc.get("repetida"))
+    return Rule(WEEKLY, mask, 1, 0, start, end) if mask else None
+
+
+def is_plain_weekly(rule):
+    """Máscara semanal sem início nem fim: basta o dia da semana para responder."""
+    return rule is not None and rule.kind == WEEKLY and rule.start is None and rule.end is None
+
+
+def candidate_mask(rule):
+    """repeat_mask para índices: a máscara semanal, ou OTHER_RULE_BIT para as demais regras."""
+    if rule is None:
+        return 0
+    return rule.mask if is_plain_weekly(rule) else OTHER_RULE_BIT
+
+
+def _month_day(rule, year, month):
+    return min(rule.day, calendar.monthrange(year, month)[1])
+
+
+def occurs_on(rule, day):
+    if rule is None:
+        return False
+    if (rule.start and day < rule.start) or (rule.end and day > rule.end):
+        return False
+    if rule.kind == WEEKLY:
+        return bool(rule.mask >> day.weekday() & 1)
+    if rule.kind == EVERY_N_DAYS:
+        return (day - rule.start).days % rule.interval == 0
+    return day.day == _month_day(rule, day.year, day.month)
+
+
+@functools.lru_cache(maxsize=1024)
+def occurrences(rule, start, end):
+    """Datas (tupla ordenada) em que a regra ocorre de start a end, inclusive.
+
+    Em cache por (regra, janela): as telas repetem as mesmas janelas o tempo todo.
+    """
+    if rule is None:
+        return ()
+    lo = max(start, rule.start) if rule.start else start
+    hi = min(end, rule.end) if rule.end else end
+    if lo > hi:
+        return ()
+
+    if rule.kind == WEEKLY:
+        days = []
+        for offset in range(min(7, (hi - lo).days + 1)):
+            first = lo + datetime.timedelta(days=offset)
+            if rule.mask >> first.weekday() & 1:
+                days.extend(first + datetime.timedelta(weeks=k) for k in range((hi - first).days // 7 + 1))
+        return tuple(sorted(days))
+
+    if rule.kind == EVERY_N_DAYS:
+        first = lo + datetime.timedelta(days=-(lo - rule.start).days % rule.interval)
+        count = (hi - first).days // rule.interval + 1 if first <= hi else 0
+        return tuple(first + datetime.timedelta(days=k * rule.interval) for k in range(count))
+
+    days = []
+    year, month = lo.year, lo.month
+    while (year, month) <= (hi.year, hi.month):
+        day = datetime.date(year, month, _month_day(rule, year, month))
+        if lo <= day <= hi:
+            days.append(day)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return tuple(days)
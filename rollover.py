@@ -0,0 +1,91 @@
+import datetime
+
+from PySide6 import QtCore
+
+from data_manager import load_missions, save_missions_to_file, transaction
+from event_bus import bus
+from recurrence import occurs_on, rule_from_doc
+
+
+def end_of_week(today):
+    days_until_sunday = 6 - today.weekday()
+
+    if days_until_sunday == 0:
+        days_until_sunday = 7
+
+    return today + datetime.timedelta(days=days_until_sunday)
+
+
+def _roll_mission(m, today, end_week):
+    """Aplica a virada de dia numa missão. Retorna True se alterou."""
+    if m["status"] == "deleted" or not m["prazo"]:
+        return False
+
+    changed = False
+    prazo = datetime.date.fromisoformat(m["prazo"])
+    rule = rule_from_doc(m)
+
+    # Repetições: a ocorrência de hoje volta como pendente, ou fica atrasada se o dia passou
+    if rule is not None:
+        if occurs_on(rule, today):
+            if prazo != today:
+                m["status"] = "Pendente"
+                m.pop("data_conclusao", None)
+                m["prazo"] = today.isoformat()
+                prazo = today
+                changed = True
+        elif prazo < today and m["status"] not in ("Concluída", "Atrasada"):
+            m["status"] = "Atrasada"
+            changed = True
+
+    # Aba de acordo com o prazo
+    old_tipo = m["tipo"]
+    if prazo == today and old_tipo != "DIÁRIAS":
+        m["tipo"] = "DIÁRIAS"
+    elif today < prazo <= end_week and old_tipo == "MENSAIS":
+        m["tipo"] = "SEMANAIS"
+    elif prazo > end_week and old_tipo != "MENSAIS":
+        m["tipo"] = "MENSAIS"
+    return changed or m["tipo"] != old_tipo
+
+
+def roll_over(today=None):
+    """Reclassifica abas, reinicia repetições e marca atrasos numa única passada.
+
+    Grava missions.json uma vez, e só se algo mudou. Retorna quantas missões mudaram.
+    """
+    today = today or datetime.date.today()
+    end_week = end_of_week(today)
+
+    with transaction():
+        data = load_missions()
+        changed = sum(1 for m in data["missions"] if _roll_mission(m, today, end_week))
+        if changed:
+            save_missions_to_file(data)
+    return changed
+
+
+class RolloverTimer(QtCore.QObject):
+    """Roda roll_over na virada do dia e avisa as telas por bus.day_changed."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.today = datetime.date.today()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check_day)
+        self.schedule()
+
+    def schedule(self):
+        now = datetime.datetime.now()
+        midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+        # Um segundo de folga; se o PC dormiu, o timer dispara atrasado e check_day resolve
+        self.timer.start(int((midnight - now).total_seconds() * 1000) + 1000)
+
+    def check_day(self):
+        today = datetime.date.today()
+        if today != self.today:
+            self.today = today
+            roll_over(today)
+            bus.day_changed.emit(today.isoformat())
+        self.schedule()
@@ -1,5 +1,6 @@
 from PySide6 import QtCore, QtWidgets, QtGui
 from data_manager import load_config, save_config
+from sound_manager import sounds
 
 
 class ColorPicker(QtWidgets.QFrame):
@@ -111,6 +112,41 @@ class ConfigScreen(QtWidgets.QWidget):
 
         self.main_layout.insertWidget(1, msg_card)
 
+        audio_card = QtWidgets.QFrame()
+        audio_card.setStyleSheet("""
+            QFrame {
+                background:#1b1430;
+                border:1px solid #322f50;
+                border-radius:12px;
+            }
+        """)
+        audio_layout = QtWidgets.QHBoxLayout(audio_card)
+        audio_layout.setContentsMargins(15,10,15,10)
+
+        audio = self.config.get("audio", {})
+
+        self.sound_check = QtWidgets.QCheckBox("Sons")
+        self.sound_check.setStyleSheet("color:white;font-weight:bold;border:none;")
+        self.sound_check.setChecked(not audio.get("mudo", False))
+
+        self.volume_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.volume_slider.setRange(0, 100)
+        self.volume_slider.setValue(int(audio.get("volume", 1.0) * 100))
+        self.volume_slider.setEnabled(self.sound_check.isChecked())
+        self.volume_slider.setStyleSheet("border:none;")
+
+        self.sound_check.toggled.connect(self.save_audio)
+        # Grava quando o volume para de mudar (mouse, teclado ou page step), não a cada passo
+        self.volume_timer = QtCore.QTimer(self)
+        self.volume_timer.setSingleShot(True)
+        self.volume_timer.timeout.connect(self.save_audio)
+        self.volume_slider.valueChanged.connect(lambda: self.volume_timer.start(300))
+
+        audio_layout.addWidget(self.sound_check)
+        audio_layout.addWidget(self.volume_slider, 1)
+
+        self.main_layout.insertWidget(2, audio_card)
+
         self.scroll = QtWidgets.QScrollArea()
         self.scroll.setWidgetResizable(True)
         self.scroll.setFrameShape(QtWidgets.QFrame.NoFrame)
@@ -293,6 +329,21 @@ class ConfigScreen(QtWidgets.QWidget):
         self.config["categorias"][key]["cor"] = color
         save_config(self.config)
         self.load_categories()
+
+    def save_audio(self):
+        self.volume_timer.stop()
+        self.volume_slider.setEnabled(self.sound_check.isChecked())
+        audio = {
+            "mudo": not self.sound_check.isChecked(),
+            "volume": self.volume_slider.value() / 100
+        }
+        # Config recém-lida: a cópia da tela pode estar velha (pontos vêm do ledger)
+        config = load_config()
+        config["audio"] = audio
+        self.config["audio"] = dict(audio)
+        save_config(config)
+        sounds.play("click")
+
     def save_daily_message(self):
         text = self.daily_input.text().strip()
 
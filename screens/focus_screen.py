@@ -1,9 +1,10 @@
 from PySide6 import QtCore, QtWidgets, QtGui
 from datetime import datetime
-from data_manager import load_focus_history, save_focus_history, load_missions, verificar_sequencia_foco
-from PySide6.QtMultimedia import QSoundEffect
-from PySide6.QtCore import QUrl
+from data_manager import add_focus_session, focus_seconds, focus_sessions, open_missions, get_mission
 from widgets.notifications import Notification
+from io_worker import worker
+import streaks
+from sound_manager import sounds
 import sys
 import os
 
@@ -29,28 +30,6 @@ class FocusScreen(QtWidgets.QWidget):
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.update_time)
         
-        sound_path = resource_path("audio/focus_done.wav")
-        self.finish_sound = QSoundEffect(self)
-
-        self.finish_sound.setSource(
-            QUrl.fromLocalFile(sound_path)
-        )
-        self.finish_sound.setVolume(0.5)
-
-        sound_path = resource_path("audio/ui-on.wav")
-        self.ui_on_sound = QSoundEffect(self)
-        self.ui_on_sound.setSource(
-            QUrl.fromLocalFile(sound_path)
-        )
-        self.ui_on_sound.setVolume(0.25)
-
-        sound_path = resource_path("audio/ui-off.wav")
-        self.ui_off_sound = QSoundEffect(self)
-        self.ui_off_sound.setSource(
-            QUrl.fromLocalFile(sound_path)
-        )
-        self.ui_off_sound.setVolume(0.5)
-
         self.current_mission_id = None
 
         self.build_ui()
@@ -197,10 +176,10 @@ class FocusScreen(QtWidgets.QWidget):
         return self.time_selector
 
     def play_ui_on(self):
-        self.ui_on_sound.play()
+        sounds.play("ui_on")
     
     def play_ui_off(self):
-        self.ui_off_sound.play()
+        sounds.play("ui_off")
 
     def build_timer_card(self):
         container = QtWidgets.QFrame()
@@ -299,8 +278,7 @@ class FocusScreen(QtWidgets.QWidget):
             }
         """)
 
-        data = load_missions()
-        missions = [m for m in data.get("missions", []) if m["status"] != "Concluída"]
+        missions = open_missions()
         
         if not missions:
             action = menu.addAction("Nenhuma missão ativa encontrada")
@@ -337,12 +315,8 @@ class FocusScreen(QtWidgets.QWidget):
         return container
 
     def load_initial_history(self):
-        data = load_focus_history()
-
         today_key = datetime.now().strftime("%Y-%m-%d")
-        today_data = data.get(today_key, {})
-
-        sessions = today_data.get("sessions", [])
+        sessions = focus_sessions(today_key)
 
         if not sessions:
             empty_label = QtWidgets.QLabel("Nenhuma sessão hoje ainda.")
@@ -351,12 +325,9 @@ class FocusScreen(QtWidgets.QWidget):
             return
 
         for session in reversed(sessions):
-            start_dt = datetime.fromisoformat(session["start"])
-            end_dt = datetime.fromisoformat(session["end"])
-
             self.add_to_history(
-                start_dt,
-                end_dt,
+                session.started,
+                session.ended,
                 session["elapsed"],
                 mode=session.get("mode"),
                 mission_id=session.get("mission_id")
@@ -383,8 +354,7 @@ class FocusScreen(QtWidgets.QWidget):
         badges_layout.addWidget(m_lbl)
 
         if mission_id:
-            all_missions = load_missions().get("missions", [])
-            mission = next((m for m in all_missions if m["id"] == mission_id), None)
+            mission = get_mission(mission_id)
             if mission:
                 miss_lbl = QtWidgets.QLabel(f"◈ {mission['titulo'].upper()}")
                 miss_lbl.setStyleSheet("font-size: 9px; color: #00fa9a; font-weight: 900; letter-spacing: 0.5px; border: none;")
@@ -402,17 +372,15 @@ class FocusScreen(QtWidgets.QWidget):
         
         layout.addLayout(l_info); layout.addStretch(); layout.addLayout(r_info)
         self.history_list_container.insertWidget(0, item)
+        return item
         
     def finish_session(self):
         if not self.start_time: self.stop_timer(); return
         end_time = datetime.now()
         elapsed = (self.total_seconds - self.current_seconds) if self.mode == "TIMER" else self.current_seconds
 
+        day_key = self.start_time.strftime("%Y-%m-%d")
         if elapsed > 0:
-            day_key = self.start_time.strftime("%Y-%m-%d")
-            data = load_focus_history()
-            if day_key not in data: data[day_key] = {"total_seconds": 0, "sessions": []}
-            
             session = {
                 "mode": self.mode, 
                 "start": self.start_time.isoformat(), 
@@ -421,26 +389,26 @@ class FocusScreen(QtWidgets.QWidget):
                 "mission_id": self.current_mission_id 
             }
             
-            data[day_key]["sessions"].append(session)
-            data[day_key]["total_seconds"] = sum(s["elapsed"] for s in data[day_key]["sessions"])
-            save_focus_history(data)
-            
-            self.add_to_history(self.start_time, end_time, elapsed, mission_id=self.current_mission_id)
-        
-        verificar_sequencia_foco()
-        self.finish_sound.play()
+            # Otimista: a sessão aparece na hora e o journal é gravado pelo io_worker
+            total_today = focus_seconds(day_key) + elapsed
+            item = self.add_to_history(self.start_time, end_time, elapsed, mission_id=self.current_mission_id)
+            worker.submit(
+                add_focus_session, day_key, session,
+                on_done=lambda day, day_key=day_key: self.session_saved(day_key),
+                on_error=lambda e, item=item: self.session_failed(item, e)
+            )
+        else:
+            total_today = focus_seconds(day_key)
+
+        sounds.play("focus_done")
         mission_name = None
         if self.current_mission_id:
-            data = load_missions()
-            mission = next((m for m in data["missions"] if m["id"] == self.current_mission_id), None)
+            mission = get_mission(self.current_mission_id)
             if mission:
                 mission_name = mission["titulo"]
 
         session_str = self.format_seconds(elapsed)
 
-        day_key = self.start_time.strftime("%Y-%m-%d")
-        data = load_focus_history()
-        total_today = data[day_key]["total_seconds"]
         total_str = self.format_seconds(total_today)
 
         title = "Foco concluído"
@@ -456,10 +424,17 @@ class FocusScreen(QtWidgets.QWidget):
             total_today=total_str
         )
         self.toast.show()
-        verificar_sequencia_foco()
         self.foco_finalizado.emit()
         self.stop_timer()
 
+    def session_saved(self, day_key):
+        streaks.update("foco", [day_key])
+
+    def session_failed(self, item, error):
+        # O journal não foi gravado e o store já avisou com save_failed:
+        # tira da lista a sessão que já estava aparecendo
+        item.deleteLater()
+
     def set_timer(self, seconds):
         if seconds <= 0: return
         self.stop_timer(); self.total_seconds = seconds; self.current_seconds = seconds; self.update_display()
@@ -497,8 +472,7 @@ class FocusScreen(QtWidgets.QWidget):
         self.update_display()
     
     def set_associated_mission(self, mission_id):
-        data = load_missions()
-        mission = next((m for m in data["missions"] if m["id"] == mission_id), None)
+        mission = get_mission(mission_id)
         if mission:
             self.current_mission_id = mission_id
             self.btn_mission_selector.setText(f"FOCO EM: {mission['titulo'].upper()}")
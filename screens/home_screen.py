@@ -3,7 +3,7 @@ import datetime
 import json
 import os
 from data_manager import (
-    load_missions, load_name, load_focus_history, load_user, save_user,
+    get_missions, load_name, focus_seconds, focus_totals, load_user,
     DATA_FILE
 )
 from progression import xp_needed_for_level, get_rank
@@ -11,7 +11,10 @@ from matplotlib.patches import FancyBboxPatch
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import math
-from data_manager import load_config, save_config, verificar_sequencia_foco
+from data_manager import get_config, load_config, transaction
+from event_bus import bus, DeferredRefresh
+import ledger
+import streaks
 
 def format_seconds_full(s):
     hrs = s // 3600
@@ -25,6 +28,13 @@ class HomeScreen(QtWidgets.QWidget):
         self.setup_ui()
         QtCore.QTimer.singleShot(50, self.refresh)
 
+        self._refresh = DeferredRefresh(self, self.refresh)
+        bus.connect_missions(self._refresh.request)
+        bus.focus_session_added.connect(self._refresh.request)
+        bus.user_changed.connect(self._refresh.request)
+        bus.config_changed.connect(self._refresh.request)
+        bus.day_changed.connect(self._refresh.request)
+
     def setup_ui(self):
         self.main_layout = QtWidgets.QVBoxLayout(self)
         self.main_layout.setContentsMargins(40, 40, 40, 40)
@@ -89,7 +99,7 @@ class HomeScreen(QtWidgets.QWidget):
         return header_container
 
     def refresh(self):
-        verificar_sequencia_foco()
+        streaks.refresh()
         nome = load_name() or "Recruta"
         self.welcome_label.setText(f"BEM-VINDO, {nome.upper()}")
         self.stats.refresh_data()
@@ -306,14 +316,13 @@ class StatsCard(QtWidgets.QFrame):
     def refresh_data(self):
         try:
             user_data = load_user()
-            history = load_focus_history()
+            totais = focus_totals()
             u = user_data["usuario"]
         except:
             return
 
-        hoje_str = datetime.date.today().isoformat()
-        tempo_hoje = history.get(hoje_str, {}).get("total_seconds", 0)
-        tempo_total = sum(d.get("total_seconds", 0) for d in history.values())
+        tempo_hoje = totais["day"]
+        tempo_total = totais["all_time"]
         self.lbl_foco_total.setText(format_seconds_full(tempo_total))
         self.lbl_foco_hoje.setText(f"Hoje: {format_seconds_full(tempo_hoje)}")
 
@@ -339,7 +348,7 @@ class StatsCard(QtWidgets.QFrame):
 
         for i in range(7):
             dia = (segunda + datetime.timedelta(days=i)).isoformat()
-            s = history.get(dia, {}).get("total_seconds", 0)
+            s = focus_seconds(dia)
             tempos.append(s / 3600) 
 
         max_estudo = max(tempos) if tempos else 0
@@ -485,9 +494,8 @@ class SkillsCard(HomeCard):
 
         try:
             user_data = load_user()
-            config = load_config()
             u = user_data["usuario"]
-            categorias = config.get("categorias", {})
+            categorias = get_config().get("categorias", {})
         except:
             return
 
@@ -592,22 +600,18 @@ class SkillsCard(HomeCard):
             self.body.addWidget(row_widget)
 
     def add_point(self, key):
-        user = load_user()
-        config = load_config()
-
-        if user["usuario"]["pontos_disponiveis"] <= 0:
-            return
-
-        if key not in config.get("categorias", {}):
-            return
+        # A HomeScreen se redesenha pelos eventos user_changed/config_changed
+        with transaction():
+            user = load_user()
+            config = load_config()
 
-        user["usuario"]["pontos_disponiveis"] -= 1
-        config["categorias"][key]["pontos"] = config["categorias"][key].get("pontos", 0) + 1
+            if user["usuario"]["pontos_disponiveis"] <= 0:
+                return
 
-        save_user(user)
-        save_config(config)
+            if key not in config.get("categorias", {}):
+                return
 
-        self.refresh_data()
+            ledger.record([ledger.point_spent(key)])
 
 class SummaryCard(HomeCard):
     def __init__(self):
@@ -619,8 +623,7 @@ class SummaryCard(HomeCard):
             item = self.body.takeAt(0)
             if item.widget(): item.widget().deleteLater()
                 
-        data = load_missions()
-        m_list = data.get("missions", [])
+        m_list = get_missions()
         
         # Lógica de contagem
         pendentes = len([m for m in m_list if m["status"] == "Pendente"])
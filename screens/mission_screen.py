@@ -1,13 +1,15 @@
 from PySide6 import QtCore, QtWidgets, QtGui
 import datetime
-from PySide6.QtMultimedia import QSoundEffect
-from PySide6.QtCore import QUrl
-from data_manager import load_missions, save_missions_to_file
-from widgets.mission_card import MissionCard
+from data_manager import load_missions, save_missions_to_file, get_mission, get_missions, next_id, next_ids
+from widgets.mission_list import MissionListView
 from widgets.edit_modal import EditMissionModal
 from widgets.custom_button import RotatableButton
-from data_manager import load_user, save_user, save_config, load_config
-from progression import add_xp_to_user
+from data_manager import load_user, get_config, transaction
+import ledger
+import streaks
+from sound_manager import sounds
+from event_bus import bus, DeferredRefresh
+from bucketing import bucket, columns_for
 
 import sys
 import os
@@ -49,22 +51,6 @@ class MissionScreen(QtWidgets.QWidget):
         self.layout.setContentsMargins(40, 40, 40, 40)
         self.layout.setSpacing(25)
         
-        self.finished_mission_sound = QSoundEffect(self)
-        sound_path = resource_path("audio/complete.wav")
-
-        self.finished_mission_sound.setSource(
-            QUrl.fromLocalFile(sound_path)
-        )
-        self.finished_mission_sound.setVolume(0.5)
-
-        sound_path = resource_path("audio/incomplete.wav")
-        self.unfinished_mission_sound = QSoundEffect(self)
-
-        self.unfinished_mission_sound.setSource(
-            QUrl.fromLocalFile(sound_path)
-        )
-        self.unfinished_mission_sound.setVolume(0.3)
-
         header_widget = QtWidgets.QWidget()
         header_layout = QtWidgets.QHBoxLayout(header_widget)
         header_layout.setContentsMargins(0, 0, 0, 0)
@@ -119,20 +105,22 @@ class MissionScreen(QtWidgets.QWidget):
         self.input_new.hide()
         self.input_new.setStyleSheet("background-color: #1b1430; border: 1px solid #5E12F8; border-radius: 10px; padding: 0 15px; color: white;")
         self.input_new.returnPressed.connect(self.create_mission)
+        self.input_new.installEventFilter(self)
         self.layout.addWidget(self.input_new)
 
-        self.missions_container = QtWidgets.QVBoxLayout()
-        self.missions_container.setAlignment(QtCore.Qt.AlignTop)
-        self.missions_container.setSpacing(12)
-        
-        scroll = QtWidgets.QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background: transparent; border: none;")
-        content = QtWidgets.QWidget()
-        content.setStyleSheet("background: transparent;")
-        content.setLayout(self.missions_container)
-        scroll.setWidget(content)
-        self.layout.addWidget(scroll)
+        self.bulk_bar = self.build_bulk_bar()
+        self.bulk_bar.hide()
+        self.layout.addWidget(self.bulk_bar)
+
+        # Lista virtualizada: só as linhas visíveis são pintadas, sem um QFrame por missão
+        self.mission_list = MissionListView()
+        self.mission_list.edit_requested.connect(self.edit)
+        self.mission_list.clicked_mission.connect(self.abrir_detalhes)
+        self.mission_list.status_changed.connect(self.sync)
+        self.mission_list.date_changed.connect(self.update_mission_date)
+        self.mission_list.associate_requested.connect(self.associate_focus)
+        self.mission_list.selection_changed.connect(self.update_bulk_bar)
+        self.layout.addWidget(self.mission_list)
 
         self.status_footer = QtWidgets.QLabel("Nenhuma missão restante.")
         self.status_footer.setAlignment(QtCore.Qt.AlignCenter)
@@ -142,6 +130,14 @@ class MissionScreen(QtWidgets.QWidget):
         self.anim = QtCore.QPropertyAnimation(self.btn_add, b"rotation", self)
         self.load_all()
 
+        self._refresh = DeferredRefresh(self, self.load_all)
+        bus.connect_missions(self._refresh.request)
+        bus.config_changed.connect(self._refresh.request)
+        bus.day_changed.connect(self._refresh.request)
+        # Cor da categoria e "Hoje"/"Amanhã" não mudam a missão: o reconciliador não repinta sozinho
+        bus.config_changed.connect(self.repaint_cards)
+        bus.day_changed.connect(self.repaint_cards)
+
     def get_type_by_date(self, target_date):
         """Helper para definir a aba correta baseada na data."""
         today = datetime.date.today()
@@ -205,246 +201,136 @@ class MissionScreen(QtWidgets.QWidget):
             
         return container
 
-    def change_filter(self):
-        self.current_filter = self.tab_group.checkedButton().text()
-        self.load_all()
-
-    def add_section_title(self, text):
-        label = QtWidgets.QLabel(text)
-        label.setStyleSheet("""
-            color: rgba(255,255,255,0.5);
-            font-size: 11px;
-            letter-spacing: 1px;
-            margin-top: 15px;
-            margin-bottom: 5px;
+    def build_bulk_bar(self):
+        bar = QtWidgets.QFrame()
+        bar.setFixedHeight(45)
+        bar.setStyleSheet("""
+            QFrame { background-color: #1b1430; border: 1px solid #5E12F8; border-radius: 10px; }
+            QLabel { border: none; color: white; font-size: 11px; font-weight: bold; }
+            QPushButton {
+                background: transparent; color: rgba(255,255,255,0.7); border: none;
+                font-size: 10px; font-weight: bold; letter-spacing: 1px; padding: 0 8px;
+            }
+            QPushButton:hover { color: white; }
+            QSpinBox, QComboBox {
+                background: #161026; color: white; border: 1px solid #2d234a;
+                border-radius: 6px; padding: 2px 6px; font-size: 10px;
+            }
         """)
-        self.missions_container.addWidget(label)
-
-
-    def auto_update_tabs(self, missions):
-        today = datetime.date.today()
-        end_week = end_of_week()
-        changed = False
-
-        for m in missions:
-            if m.get("status") == "deleted":
-                continue
 
-            prazo_str = m.get("prazo")
-            if not prazo_str:
+        layout = QtWidgets.QHBoxLayout(bar)
+        layout.setContentsMargins(15, 0, 8, 0)
+        layout.setSpacing(6)
+
+        self.bulk_label = QtWidgets.QLabel()
+        layout.addWidget(self.bulk_label)
+        layout.addStretch()
+
+        self.bulk_days = QtWidgets.QSpinBox()
+        self.bulk_days.setRange(1, 365)
+        self.bulk_days.setSuffix(" d")
+
+        self.bulk_category = QtWidgets.QComboBox()
+
+        actions = [
+            ("CONCLUIR", lambda ids: self.set_done(ids, True)),
+            ("REABRIR", lambda ids: self.set_done(ids, False)),
+            ("ADIAR", lambda ids: self.defer_missions(ids, self.bulk_days.value())),
+            (self.bulk_days, None),
+            ("CATEGORIA", lambda ids: self.set_missions_category(ids, self.bulk_category.currentData())),
+            (self.bulk_category, None),
+            ("EXCLUIR", self.delete_missions),
+            ("×", lambda ids: None),
+        ]
+        for text, action in actions:
+            if action is None:
+                layout.addWidget(text)
                 continue
+            btn = QtWidgets.QPushButton(text)
+            btn.setCursor(QtCore.Qt.PointingHandCursor)
+            btn.clicked.connect(lambda _, a=action: self.run_bulk(a))
+            layout.addWidget(btn)
+        return bar
+
+    def update_bulk_bar(self, ids):
+        if ids and not self.bulk_bar.isVisible():
+            # As categorias podem ter mudado desde a última seleção
+            self.bulk_category.clear()
+            self.bulk_category.addItem("Sem categoria", None)
+            for key, cat in get_config().get("categorias", {}).items():
+                if cat.get("ativa", True):
+                    nome = cat.get("nome", key)
+                    self.bulk_category.addItem(nome.upper(), nome)
+        self.bulk_label.setText(f"{len(ids)} selecionada{'s' if len(ids) != 1 else ''}")
+        self.bulk_bar.setVisible(bool(ids))
+
+    def run_bulk(self, action):
+        ids = self.mission_list.selected_ids()
+        self.mission_list.clearSelection()
+        if ids:
+            action(ids)
 
-            prazo = datetime.date.fromisoformat(prazo_str)
-            old_tipo = m.get("tipo", "DIÁRIAS")
-
-            if prazo == today and old_tipo != "DIÁRIAS":
-                m["tipo"] = "DIÁRIAS"
-                changed = True
-
-            elif today < prazo <= end_week and old_tipo == "MENSAIS":
-                m["tipo"] = "SEMANAIS"
-                changed = True
-
-            elif prazo > end_week and old_tipo != "MENSAIS":
-                m["tipo"] = "MENSAIS"
-                changed = True
-
-        return changed
-
-    def migrate_late_to_daily(self, missions):
-        today = datetime.date.today()
-
-        for m in missions:
-            if m.get("status") in ["Concluída", "deleted"]:
-                continue
-
-            prazo_iso = m.get("prazo")
-            if not prazo_iso:
-                continue
-
-            prazo = datetime.date.fromisoformat(prazo_iso)
-
-            if prazo <= today:
-                m["tipo"] = "DIÁRIAS"
-            else:
-                m["tipo"] = self.get_type_by_date(prazo)
-
-    def check_repetitions(self, missions):
-        today = datetime.date.today()
-        today_weekday = today.weekday()
-        changed = False
-
-        for m in missions:
-            if m.get("status") == "deleted":
-                continue
-
-            repet = m.get("repetida", [])
-            if not any(repet):
-                continue
-
-            prazo_str = m.get("prazo")
-            if not prazo_str:
-                continue
-
-            prazo = datetime.date.fromisoformat(prazo_str)
-
-            if repet[today_weekday]:
-
-                if prazo != today:
-                    m["status"] = "Pendente"
-                    m["prazo"] = today.isoformat()
-                    changed = True
-
-            else:
-                if prazo < today and m["status"] != "Concluída":
-                    m["status"] = "Atrasada"
-                    changed = True
+    def change_filter(self):
+        self.current_filter = self.tab_group.checkedButton().text()
+        self.load_all()
 
-        return changed
 
-    def abrir_detalhes(self, card):
-        data = load_missions()
-        
-        mission_data = next((m for m in data["missions"] if m["id"] == card.mission_id), None)
+    def abrir_detalhes(self, mission_id):
+        mission_data = get_mission(mission_id)
         
         if mission_data:
             from widgets.detail_mission_modal import DetailsMissionModal
-            modal = DetailsMissionModal(mission_data, self.window())
+            modal = DetailsMissionModal(dict(mission_data), self.window())
             
-            modal.edit_requested.connect(lambda: self.edit(card))
+            modal.edit_requested.connect(lambda: self.edit(mission_id))
             
             modal.exec()
 
-    def load_all(self):
-        while self.missions_container.count():
-            item = self.missions_container.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        data = load_missions()
-        missions = data.get("missions", [])
-
-        if self.check_repetitions(missions):
-            save_missions_to_file(data)
+    def associate_focus(self, mission_id):
+        main_window = self.window()
+        if hasattr(main_window, 'set_focus_mission'):
+            main_window.set_focus_mission(mission_id)
 
-        if self.auto_update_tabs(missions):
-            save_missions_to_file(data)
+    def repaint_cards(self, *args):
+        self.mission_list.viewport().update()
 
-        today = datetime.date.today()
-        today_iso = today.isoformat()
-        today_weekday = today.weekday()
-
-        changed = False
-        active, late, done = [], [], []
-
-        for m in missions:
-            if m.get("status") == "deleted":
-                continue
-
-            tipo = m.get("tipo", "DIÁRIAS")
-            if tipo != self.current_filter:
-                continue
-
-            prazo_str = m.get("prazo")
-            prazo = datetime.date.fromisoformat(prazo_str) if prazo_str else today
+    def load_all(self):
+        # Só leitura: repetições, atrasos e abas já foram ajustados pelo rollover.roll_over
+        columns = columns_for(get_missions())
+        sections = bucket(columns, datetime.date.today())[self.current_filter]
+        active = columns.take(sections["active"])
+        late = columns.take(sections["late"])
+        done = columns.take(sections["done"])
+
+        self.mission_list.list_model.set_sections([
+            ("ATIVAS", "Pendente", active),
+            ("ATRASADAS", "Atrasada", late),
+            ("CONCLUÍDAS", "Concluída", done),
+        ])
 
-            if m["status"] == "Concluída":
-                repet = m.get("repetida", [])
-                
-                if any(repet) and repet[today_weekday]:
-                    pass  
-                
-                else:
-                    if prazo_str == today_iso:
-                        done.append(m)
-                    continue
+        self.status_footer.setVisible(not (active or late or done))
 
-            # Lógica para Repetições (se houver)
-            repet = m.get("repetida", [])
-            if any(repet):
-                if repet[today_weekday]:
-                    if prazo != today:
-                        m["prazo"] = today.isoformat()
-                        m["status"] = "Pendente"
-                        changed = True
-                    active.append(m)
-                else:
-                    # Se não é dia de repetir e está atrasada
-                    if prazo < today:
-                        late.append(m)
-                    else:
-                        active.append(m)
-            else:
-                if prazo < today:
-                    late.append(m)
-                else:
-                    active.append(m)
-
-        if changed:
-            save_missions_to_file(data)
-
-        def render(m, visual_status):
-            card = MissionCard(
-                m["id"],
-                m["titulo"],
-                visual_status,
-                m.get("xp", 10),
-                m.get("descricao"),
-                m.get("categoria"),
-                m.get("prazo"),
-                m.get("repetida")
-            )
-            card.edit_requested.connect(self.edit)
-            card.clicked.connect(self.abrir_detalhes)
-            card.status_changed.connect(self.sync)
-            card.date_changed.connect(self.update_mission_date)
-
-            main_window = self.window()
-            if hasattr(main_window, 'set_focus_mission'):
-                card.associate_requested.connect(main_window.set_focus_mission)
-
-            self.missions_container.addWidget(card)
-
-        if active:
-            self.add_section_title("ATIVAS")
-            for m in active:
-                render(m, "Pendente")
-
-        if late:
-            self.add_section_title("ATRASADAS")
-            for m in late:
-                render(m, "Atrasada")
-
-        if done:
-            self.add_section_title("CONCLUÍDAS")
-            for m in done:
-                render(m, "Concluída")
+    def set_mission_date(self, m, new_date):
+        m["prazo"] = new_date
+        # Se estava atrasada, ao adiar ela volta a ficar pendente
+        if m["status"] == "Atrasada":
+            m["status"] = "Pendente"
 
-        self.status_footer.setVisible(not (active or late or done))
+        # Atualiza a aba (tipo) caso a nova data mude a categoria (ex: de diária para semanal)
+        m["tipo"] = self.get_type_by_date(datetime.date.fromisoformat(new_date))
 
     def update_mission_date(self, m_id, new_date):
         """Atualiza a data da missão no arquivo e recarrega a interface."""
         data = load_missions()
         for m in data["missions"]:
             if m["id"] == m_id:
-                m["prazo"] = new_date
-                # Se estava atrasada, ao adiar ela volta a ficar pendente
-                if m["status"] == "Atrasada":
-                    m["status"] = "Pendente"
-                
-                # Atualiza a aba (tipo) caso a nova data mude a categoria (ex: de diária para semanal)
-                m["tipo"] = self.get_type_by_date(datetime.date.fromisoformat(new_date))
+                self.set_mission_date(m, new_date)
                 break
                 
         save_missions_to_file(data)
         self.mission_completed.emit() 
-        self.load_all()
 
-    def create_mission(self):
-        title = self.input_new.text().strip()
-        if not title: return
-        
-        data = load_missions()
+    def new_mission(self, title, mission_id=None):
         today = datetime.date.today()
 
         if self.current_filter == "DIÁRIAS": prazo = end_of_day()
@@ -452,8 +338,8 @@ class MissionScreen(QtWidgets.QWidget):
         elif self.current_filter == "MENSAIS": prazo = end_of_month()
         else: prazo = today
 
-        new_m = {
-            "id": max([m["id"] for m in data["missions"]] + [0]) + 1,
+        return {
+            "id": mission_id or next_id("missions"),
             "titulo": title,
             "status": "Pendente",
             "xp": 5,
@@ -467,12 +353,37 @@ class MissionScreen(QtWidgets.QWidget):
             "tipo": self.current_filter
         }
 
-        data["missions"].append(new_m)
+    def create_mission(self):
+        title = self.input_new.text().strip()
+        if not title: return
+        
+        data = load_missions()
+        data["missions"].append(self.new_mission(title))
         save_missions_to_file(data)
-        self.load_all()
         self.input_new.clear()
         self.toggle_add()
 
+    def create_missions(self, titles):
+        """Cria uma missão por título (colar várias linhas), num único save."""
+        titles = [t.strip() for t in titles if t.strip()]
+        if not titles: return
+
+        data = load_missions()
+        ids = next_ids("missions", len(titles))
+        data["missions"].extend(self.new_mission(t, i) for t, i in zip(titles, ids))
+        save_missions_to_file(data)
+        self.input_new.clear()
+        self.toggle_add()
+
+    def eventFilter(self, obj, event):
+        # Colar texto com várias linhas no campo de nova missão cria uma missão por linha
+        if obj is self.input_new and event.type() == QtCore.QEvent.KeyPress and event.matches(QtGui.QKeySequence.Paste):
+            lines = QtWidgets.QApplication.clipboard().text().splitlines()
+            if len([l for l in lines if l.strip()]) > 1:
+                self.create_missions(lines)
+                return True
+        return super().eventFilter(obj, event)
+
     def toggle_add(self):
         is_open = self.input_new.isVisible()
         self.anim.setDuration(220)
@@ -497,9 +408,9 @@ class MissionScreen(QtWidgets.QWidget):
 
     @staticmethod
     def calculate_xp(mission):
-        base_xp = mission.get("xp", 10)
+        base_xp = mission["xp"]
 
-        if MissionScreen.is_late(mission.get("prazo")):
+        if MissionScreen.is_late(mission["prazo"]):
             return int(base_xp * 0.7)
 
         return base_xp
@@ -565,88 +476,78 @@ class MissionScreen(QtWidgets.QWidget):
 
         QtCore.QTimer.singleShot(2000, dialog.accept)
     
-    def sync(self, card):
-        data = load_missions()
-        user_data = load_user()  
-        leveled_up = False
-        level_to_show = None
-
-        for m in data["missions"]:
-            if m["id"] == card.mission_id:
-                if card.is_done:
-                    if m["status"] != "Concluída":  
-                        m["status"] = "Concluída"
-                        self.finished_mission_sound.play()
-
-                        gained_xp = self.calculate_xp(m)
-                        old_level = user_data["usuario"]["nivel"]
+    def sync(self, mission_id, done):
+        self.set_done([mission_id], done)
 
-                        user_data = add_xp_to_user(user_data, gained_xp)
+    def set_done(self, mission_ids, done):
+        """Conclui (ou reabre) várias missões numa transação: um save, um cálculo de XP, um popup."""
+        ids = set(mission_ids)
+        events = []
+        old_level = new_level = None
 
-                        new_level = user_data["usuario"]["nivel"]
+        with transaction():
+            data = load_missions()
+            old_level = load_user()["usuario"]["nivel"]
 
-                        leveled_up = new_level > old_level
-                        level_to_show = new_level
-
-                        categoria = m.get("categoria")
-                        if categoria:
-                            config = load_config()
-                            categorias = config.get("categorias", {})
-
-                            for key, cat in categorias.items():
-                                nome = cat.get("nome", "").lower()
-                                if nome == categoria.lower() or key.lower() == categoria.lower():
-                                    cat["pontos"] += 1
-                                    break
-
-                            save_config(config)
-
-                        print(f"XP ganho: {gained_xp}")
-
-                else:  
-                    if m["status"] == "Concluída":  
-                        m["status"] = "Pendente"
-                        self.unfinished_mission_sound.play()
-
-                        lost_xp = self.calculate_xp(m)
-                        user_data = add_xp_to_user(user_data, -lost_xp)  
+            for m in data["missions"]:
+                if m["id"] not in ids:
+                    continue
+                if done and m["status"] != "Concluída":
+                    m["status"] = "Concluída"
+                    events.append(ledger.completion(m, self.calculate_xp(m)))
+                    m["data_conclusao"] = events[-1]["data"]
+                elif not done and m["status"] == "Concluída":
+                    m["status"] = "Pendente"
+                    m.pop("data_conclusao", None)
+                    # Tira o XP que a conclusão deu, não o que ela daria hoje
+                    events.append(ledger.reopening(m, self.calculate_xp(m)))
+
+            if events:
+                save_missions_to_file(data)
+                new_level = ledger.record(events)["nivel"]
+                # Reabrir mexe no dia em que a missão tinha sido concluída
+                streaks.update("missoes", {e.get("data_conclusao") or e["data"] for e in events})
+
+        if not events:
+            return
+        sounds.play("complete" if done else "incomplete")
+        self.mission_completed.emit()
 
-                        categoria = m.get("categoria")
-                        if categoria:
-                            config = load_config()
-                            categorias = config.get("categorias", {})
+        if new_level > old_level:
+            QtCore.QTimer.singleShot(200, lambda: self.show_level_up_popup(new_level))
 
-                            for key, cat in categorias.items():
-                                nome = cat.get("nome", "").lower()
-                                if nome == categoria.lower() or key.lower() == categoria.lower():
-                                    cat["pontos"] = max(0, cat["pontos"] - 1)
-                                    break
+    def update_missions(self, mission_ids, apply):
+        """Aplica `apply(m)` às missões selecionadas e salva uma vez."""
+        ids = set(mission_ids)
+        data = load_missions()
+        for m in data["missions"]:
+            if m["id"] in ids:
+                apply(m)
+        save_missions_to_file(data)
+        self.mission_completed.emit()
 
-                            save_config(config)
+    def defer_missions(self, mission_ids, days):
+        today = datetime.date.today()
 
-                        print(f"XP perdido: {lost_xp}")
+        def defer(m):
+            prazo = datetime.date.fromisoformat(m["prazo"]) if m["prazo"] else today
+            self.set_mission_date(m, (max(prazo, today) + datetime.timedelta(days=days)).isoformat())
 
-        save_user(user_data)
-        save_missions_to_file(data)
-        self.mission_completed.emit()
-        self.load_all()
+        self.update_missions(mission_ids, defer)
 
-        if leveled_up:
-            QtCore.QTimer.singleShot(200, lambda: self.show_level_up_popup(level_to_show))
+    def set_missions_category(self, mission_ids, categoria):
+        self.update_missions(mission_ids, lambda m: m.update(categoria=categoria))
 
-    # Dentro da MissionScreen, na função que cria os cards:
-    def add_mission_card(self, missao):
-        card = MissionCard(missao['id'], missao['titulo'], ...)
-        
-        # Ao clicar no card, ele avisa a tela, que avisa a Main
-        card.clicked.connect(lambda c: self.mission_clicked.emit(missao))
+    def delete_missions(self, mission_ids):
+        self.update_missions(mission_ids, lambda m: m.update(status="deleted"))
 
-    def edit(self, card):
-        data = load_missions()
-        mission_data = next(m for m in data["missions"] if m["id"] == card.mission_id)
+    def edit(self, mission_id):
+        mission_data = get_mission(mission_id)
+        if not mission_data:
+            return
 
-        modal = EditMissionModal(mission_data, self)
-        modal.accepted.connect(lambda nv: self.save_edit(card.mission_id, nv))
+        modal = EditMissionModal(dict(mission_data), self)
+        modal.accepted.connect(lambda nv: self.save_edit(mission_id, nv))
         modal.deleted.connect(self.delete_mission)
         modal.exec()
 
@@ -657,7 +558,6 @@ class MissionScreen(QtWidgets.QWidget):
                 m.update(nv)
                 break
         save_missions_to_file(data)
-        self.load_all()
         self.mission_completed.emit()
     
     def delete_mission(self, m_id):
@@ -669,6 +569,5 @@ class MissionScreen(QtWidgets.QWidget):
                 break
 
         save_missions_to_file(data)
-        self.load_all()
         self.mission_completed.emit()
 
@@ -2,7 +2,8 @@ from PySide6 import QtCore, QtWidgets
 import datetime
 from widgets.custom_button import RotatableButton
 from widgets.note_card import NoteCard
-from data_manager import load_notes, save_notes
+from data_manager import get_notes, load_notes, save_notes
+from event_bus import bus, DeferredRefresh
 from widgets.note_modal import NoteModal
 
 class NotesScreen(QtWidgets.QWidget):
@@ -78,6 +79,9 @@ class NotesScreen(QtWidgets.QWidget):
         self.anim = QtCore.QPropertyAnimation(self.btn_add, b"rotation", self)
         self.load_all()
 
+        self._refresh = DeferredRefresh(self, self.load_all)
+        bus.notes_changed.connect(self._refresh.request)
+
     def load_all(self):
         # Limpa o container
         while self.notes_container.count():
@@ -85,13 +89,12 @@ class NotesScreen(QtWidgets.QWidget):
             w = item.widget()
             if w: w.deleteLater()
 
-        data = load_notes()
-        notes = data.get("notes", [])
+        notes = get_notes()
 
         # ORDENAÇÃO: 1º Pinned (True/False), 2º ID (Maior primeiro)
         sorted_notes = sorted(
             notes, 
-            key=lambda x: (x.get("pinned", False), x.get("id", 0)), 
+            key=lambda x: (x["pinned"], x["id"]), 
             reverse=True
         )
 
@@ -101,10 +104,10 @@ class NotesScreen(QtWidgets.QWidget):
                 n["id"], 
                 n["title"], 
                 n["text"], 
-                n.get("color", "#1e1b2e"), 
-                n.get("pinned", False)
+                n["color"], 
+                n["pinned"]
             )
-            card.clicked.connect(lambda c, note=n: self.open_note(note))
+            card.clicked.connect(lambda c, note=n: self.open_note(dict(note)))
             card.pin_toggled.connect(self.toggle_pin_status)
             self.notes_container.addWidget(card)
 
@@ -115,7 +118,6 @@ class NotesScreen(QtWidgets.QWidget):
                 n["pinned"] = status
                 break
         save_notes(data)
-        self.load_all()
 
     def open_note(self, note_data):
         self.show_modal(note_data)
@@ -144,7 +146,6 @@ class NotesScreen(QtWidgets.QWidget):
         m_y = (self.height() - self.modal.height()) // 2
         self.modal.move(m_x, m_y)
 
-        self.modal.note_saved.connect(self.load_all)
         self.modal.note_saved.connect(self.close_modal)
 
         def click_outside(event):
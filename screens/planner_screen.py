@@ -1,9 +1,9 @@
 from PySide6 import QtCore, QtWidgets, QtGui
 import datetime
-from data_manager import load_missions, resource_path, save_missions_to_file, load_config
+from data_manager import load_missions, missions_for_day, missions_between, save_missions_to_file, get_category
+from event_bus import bus, DeferredRefresh
 from widgets.notifications import Notification
-from PySide6.QtMultimedia import QSoundEffect
-from PySide6.QtCore import QUrl
+from sound_manager import sounds
 import sys
 import os
 
@@ -18,29 +18,17 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def time_to_pixels(time_str):
-    try:
-        h, m = map(int, time_str.split(':'))
-        return (h * PX_PER_HOUR) + (m * (PX_PER_HOUR / 60)) + TIMELINE_PADDING
-    except: return TIMELINE_PADDING
-
-def duration_to_pixels(start, end):
-    y_start = time_to_pixels(start)
-    y_end = time_to_pixels(end)
-    return y_end - y_start
+def minutes_to_pixels(minutes):
+    # Minutos já convertidos no Mission; horário inválido (None) fica no topo
+    return (minutes or 0) * (PX_PER_HOUR / 60) + TIMELINE_PADDING
 
 def get_category_color(categoria_nome):
-    config = load_config()
-    categorias = config.get("categorias", {})
-
     if not categoria_nome:
         return "#2d234a"  # fallback
 
-    categoria_nome = categoria_nome.strip().lower()
-
-    for key, cat in categorias.items():
-        if cat.get("nome", "").lower() == categoria_nome:
-            return cat.get("cor", "#2d234a")
+    cat = get_category(categoria_nome)
+    if cat:
+        return cat.get("cor", "#2d234a")
 
     return "#2d234a"  # fallback caso não encontre
 
@@ -126,27 +114,14 @@ class AddMissionOverlay(QtWidgets.QFrame):
 
     def __init__(self, missions, parent, data_selecionada):
         super().__init__(parent)
-        weekday = data_selecionada.weekday()
-
         self.available_missions = []
 
         for m in missions:
 
-            if m.get("horario_inicio") and not any(m.get("repetida", [])):
+            if m["horario_inicio"] and m.rule is None:
                 continue
 
-            prazo = m.get("prazo")
-            repet = m.get("repetida", [])
-
-            aparece = False
-
-            if prazo and prazo == data_selecionada.isoformat():
-                aparece = True
-
-            if repet and len(repet) > weekday and repet[weekday]:
-                aparece = True
-
-            if aparece:
+            if m["prazo"] == data_selecionada.isoformat() or m.occurs_on(data_selecionada):
                 self.available_missions.append(m)
         
         self.filtered = self.available_missions
@@ -429,8 +404,8 @@ class PlannerCard(QtWidgets.QFrame):
         accent_color = cor_base if not is_done else "#4a4a4a"
         
         start, end = m['horario_inicio'], m['horario_fim']
-        y = time_to_pixels(start)
-        h_real = duration_to_pixels(start, end)
+        y = minutes_to_pixels(m.start_min)
+        h_real = minutes_to_pixels(m.end_min) - y
         
         h_visual = max(h_real, 60) 
         
@@ -494,7 +469,7 @@ class PlannerCard(QtWidgets.QFrame):
 
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.LeftButton:
-            self.clicked.emit(self.mission_data)
+            self.clicked.emit(dict(self.mission_data))
 
 class DaySelectorWidget(QtWidgets.QWidget):
     day_selected = QtCore.Signal(datetime.date)
@@ -526,9 +501,19 @@ class DaySelectorWidget(QtWidgets.QWidget):
         texto = f"{dias_semana[date.weekday()]}\n{date.day}"
         btn.setText(texto)
         btn.setProperty("date", date)
+        btn.setProperty("label", texto)
         btn.clicked.connect(lambda: self.select_date(date))
         return btn
 
+    def dates(self):
+        return [btn.property("date") for btn in self.buttons]
+
+    def set_counts(self, counts):
+        # Um ponto por missão do dia (até três), vindo das ocorrências da janela
+        for btn in self.buttons:
+            n = counts.get(btn.property("date"), 0)
+            btn.setText(btn.property("label") + ("\n" + "•" * min(n, 3) if n else ""))
+
     def select_date(self, date):
         self.selected_date = date
         self.update_styles()
@@ -566,14 +551,6 @@ class PlannerScreen(QtWidgets.QWidget):
         self.clock_timer.timeout.connect(self.check_mission_time)
         self.clock_timer.start(30000) 
 
-        sound_path = resource_path("audio/focus_done.wav")
-        self.finish_sound = QSoundEffect(self)
-
-        self.finish_sound.setSource(
-            QUrl.fromLocalFile(sound_path)
-        )
-        self.finish_sound.setVolume(0.5)
-
         self.main_layout = QtWidgets.QVBoxLayout(self)
         self.main_layout.setContentsMargins(0, 10, 0, 0)
         self.main_layout.setSpacing(10)
@@ -596,49 +573,27 @@ class PlannerScreen(QtWidgets.QWidget):
         self.setup_timeline()
         self.load_all()
 
+        self._refresh = DeferredRefresh(self, self.load_all)
+        bus.connect_missions(self._refresh.request)
+        bus.config_changed.connect(self._refresh.request)
+        bus.day_changed.connect(self.on_day_changed)
+
     def change_date(self, date):
         self.current_date = date
         self.load_all() 
 
+    def on_day_changed(self, day_iso):
+        self.reset_daily_notifications()
+        self._refresh.request()
+
     def check_mission_time(self):
         now = datetime.datetime.now()
         today = now.date()
 
-        if not hasattr(self, "_last_date"):
-            self._last_date = today
-
-        if today != self._last_date:
-            self._last_date = today
-            self.reset_daily_notifications()
-
-        data = load_missions()
-        weekday = today.weekday()
-
-        for m in data.get("missions", []):
-            if m.get("status") == "deleted":
+        for m in missions_for_day(today, with_time=True):
+            if m.start_min is None:
                 continue
-
-            start = m.get("horario_inicio")
-            if not start:
-                continue
-
-            aparece = False
-
-            prazo = m.get("prazo")
-            repet = m.get("repetida", [])
-
-            if prazo:
-                if datetime.date.fromisoformat(prazo) == today:
-                    aparece = True
-
-            if repet and len(repet) > weekday and repet[weekday]:
-                aparece = True
-
-            if not aparece:
-                continue
-
-            h, mnt = map(int, start.split(":"))
-            mission_time = now.replace(hour=h, minute=mnt, second=0, microsecond=0)
+            mission_time = now.replace(hour=m.start_min // 60, minute=m.start_min % 60, second=0, microsecond=0)
 
             mission_key = f"{today}-{m['id']}"
             if mission_key in self.notified_today:
@@ -655,7 +610,7 @@ class PlannerScreen(QtWidgets.QWidget):
                     parent=None
                 )
 
-                self.finish_sound.play()
+                sounds.play("focus_done")
                 self.toast.show()
 
     def reset_daily_notifications(self):
@@ -694,37 +649,15 @@ class PlannerScreen(QtWidgets.QWidget):
         for child in self.timeline_container.findChildren(PlannerCard): 
             child.deleteLater()
             
-        data = load_missions()
         data_selecionada = self.current_date 
         
-        missions_filtered = []
+        missions_filtered = list(missions_for_day(data_selecionada, with_time=True))
 
-        weekday = data_selecionada.weekday()
+        dates = self.day_selector.dates()
+        by_day = missions_between(dates[0], dates[-1])
+        self.day_selector.set_counts({day: len(ms) for day, ms in by_day.items()})
 
-        for m in data.get("missions", []):
-
-            if m.get("status") == "deleted" or not m.get("horario_inicio"):
-                continue
-
-            prazo = m.get("prazo")
-            repet = m.get("repetida", [])
-
-            aparece = False
-
-            # ✔ missão normal por data
-            if prazo:
-                prazo_missao = datetime.date.fromisoformat(prazo)
-                if prazo_missao == data_selecionada:
-                    aparece = True
-
-            # ✔ missão repetida pelo weekday
-            if repet and len(repet) > weekday and repet[weekday]:
-                aparece = True
-
-            if aparece:
-                missions_filtered.append(m)
-
-        missions_filtered.sort(key=lambda x: x['horario_inicio'])
+        missions_filtered.sort(key=lambda x: x.start_min or 0)
 
         groups = []
         for m in missions_filtered:
@@ -746,13 +679,14 @@ class PlannerScreen(QtWidgets.QWidget):
                 card.show()
 
     def check_overlap(self, m1, m2):
-        s1, e1 = time_to_pixels(m1['horario_inicio']), time_to_pixels(m1['horario_fim'])
-        s2, e2 = time_to_pixels(m2['horario_inicio']), time_to_pixels(m2['horario_fim'])
+        # Horário inválido conta como 00:00, igual ao minutes_to_pixels
+        s1, e1 = m1.start_min or 0, m1.end_min or 0
+        s2, e2 = m2.start_min or 0, m2.end_min or 0
         
         return s1 < e2 and s2 < e1
 
     def open_add_modal(self):
-        missions = [m for m in load_missions().get("missions", []) if m.get("status") != "deleted"]
+        missions = missions_for_day(self.current_date)
         
         self.overlay = AddMissionOverlay(missions, self, self.current_date) 
         
@@ -771,7 +705,6 @@ class PlannerScreen(QtWidgets.QWidget):
                 m["horario_inicio"], m["horario_fim"] = res["start"], res["end"]
                 break
         save_missions_to_file(data)
-        self.load_all()
         self.planner_updated.emit()
 
     def resizeEvent(self, event):
@@ -0,0 +1,90 @@
+"""Sons da interface num só lugar, carregados na primeira vez que tocam.
+
+Cada som tem um pequeno pool de vozes (QSoundEffect): tocar de novo enquanto o
+anterior ainda soa abre outra voz em vez de cortar o som. Mudo e volume vêm de
+config["audio"]; no mudo ou sem tela (offscreen/minimal) nada é carregado, nem
+o QtMultimedia.
+"""
+from PySide6 import QtCore, QtGui
+
+from data_manager import DEFAULT_CONFIG, get_config, resource_path
+
+# nome -> (arquivo, volume do som antes do volume geral)
+SOUNDS = {
+    "complete": ("audio/complete.wav", 0.5),
+    "incomplete": ("audio/incomplete.wav", 0.3),
+    "focus_done": ("audio/focus_done.wav", 0.5),
+    "ui_on": ("audio/ui-on.wav", 0.25),
+    "ui_off": ("audio/ui-off.wav", 0.5),
+    "click": ("audio/btn-click.wav", 0.4),
+    "tick": ("audio/tick-clock.wav", 0.3),
+}
+VOICES = 3  # vozes no máximo por som
+HEADLESS_PLATFORMS = ("offscreen", "minimal")
+
+
+class SoundManager(QtCore.QObject):
+    def __init__(self):
+        super().__init__()
+        self._voices = {}
+        self._next = {}
+        self._effect_class = None
+        self._available = None
+
+    @staticmethod
+    def settings():
+        return {**DEFAULT_CONFIG["audio"], **get_config().get("audio", {})}
+
+    def _check_available(self):
+        # Decide uma vez: sem tela ou sem backend de áudio, play() vira no-op
+        if self._available is None:
+            app = QtGui.QGuiApplication.instance()
+            if app is None or app.platformName() in HEADLESS_PLATFORMS:
+                self._available = False
+            else:
+                try:
+                    from PySide6.QtMultimedia import QSoundEffect
+                except ImportError as e:
+                    print(f"Áudio indisponível: {e}")
+                    self._available = False
+                else:
+                    self._effect_class = QSoundEffect
+                    self._available = True
+        return self._available
+
+    def _new_voice(self, name):
+        effect = self._effect_class(self)
+        effect.setSource(QtCore.QUrl.fromLocalFile(resource_path(SOUNDS[name][0])))
+        return effect
+
+    def _voice(self, name):
+        voices = self._voices.setdefault(name, [])
+        for voice in voices:
+            if not voice.isPlaying():
+                return voice
+        if len(voices) < VOICES:
+            voices.append(self._new_voice(name))
+            return voices[-1]
+        # Todas tocando: reaproveita a que começou há mais tempo
+        i = self._next.get(name, 0)
+        self._next[name] = (i + 1) % len(voices)
+        return voices[i]
+
+    def preload(self):
+        """Carrega uma voz de cada som; chamada depois que a janela já apareceu."""
+        if self.settings()["mudo"] or not self._check_available():
+            return
+        for name in SOUNDS:
+            if not self._voices.get(name):
+                self._voices[name] = [self._new_voice(name)]
+
+    def play(self, name):
+        audio = self.settings()
+        if audio["mudo"] or audio["volume"] <= 0 or not self._check_available():
+            return
+        voice = self._voice(name)
+        voice.setVolume(SOUNDS[name][1] * audio["volume"])
+        voice.play()
+
+
+sounds = SoundManager()
@@ -0,0 +1,270 @@
+import datetime
+import json
+import os
+import sqlite3
+
+from recurrence import OTHER_RULE_BIT, candidate_mask, rule_from_doc
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS missions (
+    id INTEGER PRIMARY KEY,
+    prazo TEXT,
+    status TEXT,
+    tipo TEXT,
+    horario_inicio TEXT,
+    repeat_mask INTEGER NOT NULL DEFAULT 0,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_missions_prazo ON missions(prazo);
+CREATE INDEX IF NOT EXISTS idx_missions_status ON missions(status);
+CREATE INDEX IF NOT EXISTS idx_missions_tipo ON missions(tipo, status);
+CREATE INDEX IF NOT EXISTS idx_missions_horario ON missions(horario_inicio);
+CREATE INDEX IF NOT EXISTS idx_missions_recorrentes ON missions(repeat_mask) WHERE repeat_mask != 0;
+
+CREATE TABLE IF NOT EXISTS focus_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    inicio TEXT,
+    fim TEXT,
+    elapsed INTEGER NOT NULL DEFAULT 0,
+    mode TEXT,
+    mission_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_focus_day ON focus_sessions(day);
+
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    pinned INTEGER NOT NULL DEFAULT 0,
+    doc TEXT NOT NULL
+);
+"""
+
+
+def connect(path):
+    # A conexão é compartilhada entre a thread da GUI e a do flush (o data_manager serializa com lock)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def data_version(conn):
+    # Só muda quando outra conexão grava: serve para detectar edição de fora do app
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _mission_row(m):
+    return (
+        m["id"],
+        m.get("prazo"),
+        m.get("status"),
+        m.get("tipo", "DIÁRIAS"),
+        m.get("horario_inicio"),
+        candidate_mask(rule_from_doc(m)),
+        json.dumps(m, ensure_ascii=False),
+    )
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return json.loads(text) if text.strip() else default
+    except ValueError:
+        return default
+
+
+def import_json_files(conn, missions_path, load_focus_history, notes_path):
+    """Importa missions.json, o histórico de foco e notes.json uma única vez.
+
+    `load_focus_history()` devolve o histórico já com o journal aplicado (quem
+    sabe ler checkpoint + journal é o data_manager). Os arquivos JSON ficam no
+    lugar como backup.
+    """
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'json_importado'").fetchone():
+        return False
+
+    missions_doc = _read_json(missions_path, {})
+    history = dict(load_focus_history())
+    notes_doc = _read_json(notes_path, {})
+    missions = missions_doc.get("missions", [])
+    notes = notes_doc.get("notes", [])
+    # A versão do schema de cada arquivo vai para a tabela meta
+    versions = {
+        "missions": missions_doc.get("schema_version", 0),
+        "focus": history.pop("schema_version", 0),
+        "notes": notes_doc.get("schema_version", 0),
+    }
+
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO missions (id, prazo, status, tipo, horario_inicio, repeat_mask, doc) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [_mission_row(m) for m in missions],
+        )
+        _insert_focus_days(conn, history)
+        conn.executemany(
+            "INSERT OR REPLACE INTO notes (id, pinned, doc) VALUES (?, ?, ?)",
+            [_note_row(n) for n in notes],
+        )
+        for kind, version in versions.items():
+            set_meta(conn, f"schema_{kind}", version)
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_importado', '1')")
+    return True
+
+
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+# ---------- missões ----------
+
+def _docs(cursor):
+    return [json.loads(row[0]) for row in cursor]
+
+
+def load_missions(conn):
+    return _docs(conn.execute("SELECT doc FROM missions ORDER BY id"))
+
+
+def save_missions(conn, changed, removed_ids):
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO missions (id, prazo, status, tipo, horario_inicio, repeat_mask, doc) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [_mission_row(m) for m in changed],
+        )
+        conn.executemany("DELETE FROM missions WHERE id = ?", [(i,) for i in removed_ids])
+
+
+def get_mission(conn, mission_id):
+    row = conn.execute("SELECT doc FROM missions WHERE id = ?", (mission_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def missions_for_day(conn, day, with_time=False):
+    time_filter = " AND horario_inicio IS NOT NULL AND horario_inicio != ''" if with_time else ""
+    sql = (
+        "SELECT id, doc FROM missions WHERE prazo = ? AND status != 'deleted'" + time_filter +
+        " UNION "
+        "SELECT id, doc FROM missions WHERE repeat_mask != 0 AND ((repeat_mask >> ?) & 1 OR repeat_mask & ?) "
+        "AND status != 'deleted'" + time_filter +
+        " ORDER BY id"
+    )
+    return [json.loads(doc) for _, doc in conn.execute(sql, (day.isoformat(), day.weekday(), OTHER_RULE_BIT))]
+
+
+def missions_between(conn, start, end):
+    # Prazo na janela, ou regra candidata: bit de algum dia da semana da janela ou OTHER_RULE_BIT
+    weekdays = OTHER_RULE_BIT
+    for offset in range(min(7, (end - start).days + 1)):
+        weekdays |= 1 << (start + datetime.timedelta(days=offset)).weekday()
+    sql = (
+        "SELECT id, doc FROM missions WHERE prazo BETWEEN ? AND ? AND status != 'deleted'"
+        " UNION "
+        "SELECT id, doc FROM missions WHERE repeat_mask & ? AND status != 'deleted'"
+        " ORDER BY id"
+    )
+    return [json.loads(doc) for _, doc in conn.execute(sql, (start.isoformat(), end.isoformat(), weekdays))]
+
+
+def missions_by_tab(conn, tipo):
+    return _docs(conn.execute(
+        "SELECT doc FROM missions WHERE tipo = ? AND status != 'deleted' ORDER BY id", (tipo,)
+    ))
+
+
+def open_missions(conn):
+    return _docs(conn.execute(
+        "SELECT doc FROM missions WHERE status NOT IN ('Concluída', 'deleted') ORDER BY id"
+    ))
+
+
+# ---------- foco ----------
+
+def _insert_focus_days(conn, history):
+    rows = []
+    for day, info in history.items():
+        for s in info.get("sessions", []):
+            rows.append((day, s.get("start"), s.get("end"), s.get("elapsed", 0), s.get("mode"), s.get("mission_id")))
+    conn.executemany(
+        "INSERT INTO focus_sessions (day, inicio, fim, elapsed, mode, mission_id) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def add_focus_session(conn, day_key, session):
+    with conn:
+        conn.execute("BEGIN")
+        _insert_focus_days(conn, {day_key: {"sessions": [session]}})
+
+
+def _session(row):
+    return {"mode": row[1], "start": row[2], "end": row[3], "elapsed": row[4], "mission_id": row[5]}
+
+
+def load_focus_history(conn):
+    history = {}
+    for row in conn.execute(
+        "SELECT day, mode, inicio, fim, elapsed, mission_id FROM focus_sessions ORDER BY day, id"
+    ):
+        day = history.setdefault(row[0], {"total_seconds": 0, "sessions": []})
+        day["sessions"].append(_session(row))
+        day["total_seconds"] += row[4]
+    return history
+
+
+def save_focus_days(conn, changed, removed_days):
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "DELETE FROM focus_sessions WHERE day = ?",
+            [(d,) for d in list(changed) + list(removed_days)],
+        )
+        _insert_focus_days(conn, changed)
+
+
+def focus_day(conn, day_key):
+    rows = conn.execute(
+        "SELECT day, mode, inicio, fim, elapsed, mission_id FROM focus_sessions WHERE day = ? ORDER BY id",
+        (day_key,),
+    ).fetchall()
+    if not rows:
+        return None
+    sessions = [_session(r) for r in rows]
+    return {"total_seconds": sum(s["elapsed"] for s in sessions), "sessions": sessions}
+
+
+# ---------- notas ----------
+
+def _note_row(n):
+    return (n["id"], 1 if n.get("pinned") else 0, json.dumps(n, ensure_ascii=False))
+
+
+def load_notes(conn):
+    return _docs(conn.execute("SELECT doc FROM notes ORDER BY id"))
+
+
+def save_notes(conn, changed, removed_ids):
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO notes (id, pinned, doc) VALUES (?, ?, ?)",
+            [_note_row(n) for n in changed],
+        )
+        conn.executemany("DELETE FROM notes WHERE id = ?", [(i,) for i in removed_ids])
@@ -0,0 +1,139 @@
+"""Sequências de dias (missões e foco) com tolerância a falhas.
+
+Um dia conta para o foco quando soma min_foco_para_sequencia_min minutos, e
+para as missões quando tem ao menos uma conclusão valendo no ledger. Até
+tolerancia_falha_dias dias seguidos sem bater a meta não quebram a sequência.
+Cada evento atualiza a sequência em O(1); recompute() refaz tudo numa passada
+pelos dias do histórico.
+"""
+import datetime
+
+from data_manager import focus_days, get_config, load_user, save_user, transaction
+import ledger
+
+KINDS = {"missoes": "missoes_consecutivas", "foco": "foco_consecutivo"}
+
+
+class Streak:
+    """Dias seguidos que bateram a meta, com até `tolerance` dias de falha entre eles."""
+
+    def __init__(self, tolerance=0, current=0, best=0, last_day=None):
+        self.tolerance = tolerance
+        self.current = current
+        self.best = best
+        self.last_day = last_day
+
+    def hit(self, day):
+        """Conta `day` (os dias chegam em ordem; o mesmo dia não conta duas vezes)."""
+        if self.last_day is not None:
+            if day <= self.last_day:
+                return
+            if (day - self.last_day).days - 1 > self.tolerance:
+                self.current = 0
+        self.current += 1
+        self.last_day = day
+        self.best = max(self.best, self.current)
+
+    def current_on(self, today):
+        """A sequência que ainda vale em `today` (hoje mesmo ainda não conta como falha)."""
+        if self.last_day is None or (today - self.last_day).days - 1 > self.tolerance:
+            return 0
+        return self.current
+
+
+def _gameplay():
+    return get_config().get("gameplay", {})
+
+def _tolerance():
+    return max(0, int(_gameplay().get("tolerancia_falha_dias", 0)))
+
+def _qualifying_days(kind):
+    """Rollup por dia da sequência `kind`: {dia: valor} e o mínimo para o dia contar."""
+    if kind == "foco":
+        return focus_days(), _gameplay().get("min_foco_para_sequencia_min", 10) * 60
+    return ledger.totals().dias, 1
+
+def _qualifies(kind, day_key):
+    days, minimum = _qualifying_days(kind)
+    return days.get(day_key, 0) >= minimum
+
+
+def _load(seq, kind):
+    last_day = seq.get(f"{kind}_ultimo_dia")
+    return Streak(
+        _tolerance(),
+        seq.get(KINDS[kind], 0),
+        seq.get(f"{kind}_melhor", 0),
+        datetime.date.fromisoformat(last_day) if last_day else None,
+    )
+
+def _store(seq, kind, streak, today):
+    seq[KINDS[kind]] = streak.current_on(today)
+    seq[f"{kind}_melhor"] = streak.best
+    seq[f"{kind}_ultimo_dia"] = streak.last_day.isoformat() if streak.last_day else ""
+
+
+def recompute(kind):
+    """Refaz a sequência `kind` do zero numa passada pelos dias em ordem."""
+    streak = Streak(_tolerance())
+    days, minimum = _qualifying_days(kind)
+    for day_key in sorted(days):
+        if days[day_key] < minimum:
+            continue
+        try:
+            streak.hit(datetime.date.fromisoformat(day_key))
+        except ValueError:
+            continue
+    return streak
+
+
+def update(kind, day_keys=None, today=None):
+    """Atualiza a sequência `kind` depois de uma mudança nos dias `day_keys` (hoje por padrão).
+
+    Dia que passou a bater a meta entra na hora; se um dia que já contava deixou
+    de bater (missão reaberta), a sequência é refeita. Só grava se mudou.
+    """
+    today = today or datetime.date.today()
+    with transaction():
+        user = load_user()
+        seq = user["sequencia"]
+        original = dict(seq)
+        streak = _load(seq, kind)
+
+        for day_key in sorted(day_keys or [today.isoformat()]):
+            day = datetime.date.fromisoformat(day_key)
+            if _qualifies(kind, day_key):
+                streak.hit(day)
+            elif streak.last_day is not None and day <= streak.last_day:
+                streak = recompute(kind)
+                break
+
+        _store(seq, kind, streak, today)
+        if seq != original:
+            save_user(user)
+
+
+def refresh(today=None):
+    """Zera na virada do dia as sequências cujas falhas passaram da tolerância."""
+    today = today or datetime.date.today()
+    try:
+        with transaction():
+            user = load_user()
+            seq = user["sequencia"]
+            original = dict(seq)
+            for kind in KINDS:
+                _store(seq, kind, _load(seq, kind), today)
+            if seq != original:
+                save_user(user)
+    except Exception as e:
+        print(f"Erro streak: {e}")
+
+
+def recompute_all(today=None):
+    """Refaz as duas sequências a partir dos rollups de foco e do ledger."""
+    today = today or datetime.date.today()
+    with transaction():
+        user = load_user()
+        for kind in KINDS:
+            _store(user["sequencia"], kind, recompute(kind), today)
+        save_user(user)
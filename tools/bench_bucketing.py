@@ -0,0 +1,123 @@
+"""Benchmark da classificação de missões: loop por missão x colunas (NumPy ou não).
+
+Uso: python tools/bench_bucketing.py [n1 n2 ...]   (padrão: 1000 10000 100000)
+"""
+import datetime
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bucketing
+from bucketing import TABS, MissionColumns, bucket, np
+from data_manager import Mission
+
+REPEAT = 5
+
+
+def synthetic_missions(n):
+    hoje = datetime.date.today()
+    missions = []
+    for i in range(1, n + 1):
+        prazo = hoje + datetime.timedelta(days=random.randint(-60, 60))
+        missions.append(Mission({
+            "id": i,
+            "titulo": f"Missão número {i}",
+            "status": random.choice(["Pendente", "Concluída", "Atrasada", "deleted"]),
+            "xp": 5,
+            "categoria": None,
+            "prazo": prazo.isoformat() if random.random() > 0.02 else None,
+            "data_criacao": hoje.isoformat(),
+            "horario_inicio": None,
+            "horario_fim": None,
+            "descricao": "",
+            "repetida": [random.random() < 0.05 for _ in range(7)],
+            "tipo": random.choice(TABS),
+            "completada_count": 0,
+        }))
+    return missions
+
+
+def loop_bucket(missions, today):
+    # O loop do MissionScreen.load_all, aplicado às três abas
+    weekday = today.weekday()
+    result = {tab: {"active": [], "late": [], "done": []} for tab in TABS}
+    for m in missions:
+        if m["status"] == "deleted" or m["tipo"] not in result:
+            continue
+        sections = result[m["tipo"]]
+        prazo = m.due or today
+        repeats_today = m.repeats_on(weekday)
+        if m["status"] == "Concluída" and not repeats_today:
+            if m.due == today:
+                sections["done"].append(m)
+            continue
+        if repeats_today or prazo >= today:
+            sections["active"].append(m)
+        else:
+            sections["late"].append(m)
+    return result
+
+
+def best(fn, *args):
+    elapsed = float("inf")
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        result = fn(*args)
+        elapsed = min(elapsed, time.perf_counter() - t)
+    return elapsed, result
+
+
+def python_columns(missions):
+    # Colunas em listas, como ficam sem NumPy
+    saved, bucketing.np = bucketing.np, None
+    try:
+        return MissionColumns(missions)
+    finally:
+        bucketing.np = saved
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]
+    today = datetime.date.today()
+    print(f"NumPy: {np.__version__ if np is not None else 'não instalado'}")
+    print(f"{'missões':>8}{'loop ms':>10}{'colunas ms':>12}{'update ms':>11}{'append ms':>11}{'bucket ms':>11}{'python ms':>11}")
+
+    for n in sizes:
+        missions = synthetic_missions(n)
+        t_loop, expected = best(loop_bucket, missions, today)
+        t_cols, columns = best(MissionColumns, missions)
+
+        # Um save troca uma visão: as colunas só refazem aquela linha
+        edited = list(missions)
+        edited[n // 2] = Mission({**missions[n // 2], "status": "Concluída"})
+        versions = itertools.cycle([tuple(edited), tuple(missions)])
+        t_update, _ = best(lambda: columns.update(next(versions)))
+        columns.update(missions)
+
+        # Criar missão acrescenta uma visão no fim: as colunas só estendem
+        appended = list(missions) + [Mission({**missions[-1], "id": missions[-1]["id"] + 1})]
+        t_append = float("inf")
+        for _ in range(REPEAT):
+            extended = MissionColumns(missions)
+            t = time.perf_counter()
+            assert extended.update(appended)
+            t_append = min(t_append, time.perf_counter() - t)
+        assert bucketing._bucket_python(extended, today) == bucketing._bucket_python(MissionColumns(appended), today)
+        t_bucket, result = best(bucket, columns, today)
+        t_python, fallback = best(bucketing._bucket_python, python_columns(missions), today)
+        assert {t: {k: list(v) for k, v in s.items()} for t, s in result.items()} == fallback
+
+        for tab in TABS:
+            for section in ("active", "late", "done"):
+                got = [m["id"] for m in columns.take(result[tab][section])]
+                assert got == [m["id"] for m in expected[tab][section]], (tab, section)
+
+        print(f"{n:>8}{t_loop * 1000:>10.2f}{t_cols * 1000:>12.2f}{t_update * 1000:>11.2f}{t_append * 1000:>11.2f}{t_bucket * 1000:>11.2f}{t_python * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
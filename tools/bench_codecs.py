@@ -0,0 +1,103 @@
+"""Micro-benchmark dos codecs do data_manager com dados sintéticos.
+
+Uso: python tools/bench_codecs.py [n_missoes] [n_dias_foco]
+"""
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import ARCHIVE_CODEC, DEFAULT_CODEC, PRETTY_CODEC, GzipCodec, JsonCodec, OrjsonCodec, orjson
+
+REPEAT = 5
+
+
+def synthetic_missions(n):
+    hoje = datetime.date.today()
+    missions = []
+    for i in range(1, n + 1):
+        prazo = hoje + datetime.timedelta(days=random.randint(-400, 60))
+        missions.append({
+            "id": i,
+            "titulo": f"Missão número {i}",
+            "status": random.choice(["Pendente", "Concluída", "Atrasada"]),
+            "xp": random.choice([5, 10, 20]),
+            "categoria": random.choice([None, "FORÇA", "INTELIGÊNCIA", "SOCIAL"]),
+            "prazo": prazo.isoformat(),
+            "data_criacao": (prazo - datetime.timedelta(days=3)).isoformat(),
+            "horario_inicio": random.choice([None, "08:00", "14:30"]),
+            "horario_fim": None,
+            "descricao": "Descrição com acentuação: ação, revisão, atenção." * random.randint(0, 3),
+            "repetida": [random.random() < 0.1 for _ in range(7)],
+            "tipo": random.choice(["DIÁRIAS", "SEMANAIS", "MENSAIS"]),
+        })
+    return {"schema_version": 1, "missions": missions}
+
+
+def synthetic_focus(days):
+    inicio = datetime.datetime.now() - datetime.timedelta(days=days)
+    history = {}
+    for d in range(days):
+        dia = inicio + datetime.timedelta(days=d)
+        sessions = []
+        for s in range(random.randint(1, 8)):
+            start = dia + datetime.timedelta(hours=8 + s)
+            elapsed = random.randint(300, 3000)
+            sessions.append({
+                "mode": "TIMER",
+                "start": start.isoformat(),
+                "end": (start + datetime.timedelta(seconds=elapsed)).isoformat(),
+                "elapsed": elapsed,
+                "mission_id": random.randint(1, 500),
+            })
+        history[dia.date().isoformat()] = {
+            "total_seconds": sum(s["elapsed"] for s in sessions),
+            "sessions": sessions,
+        }
+    return history
+
+
+def bench(codec, data, path):
+    save = load = float("inf")
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        with open(path, "wb") as f:
+            f.write(codec.dumps(data))
+        save = min(save, time.perf_counter() - t)
+
+        t = time.perf_counter()
+        with open(path, "rb") as f:
+            codec.loads(f.read())
+        load = min(load, time.perf_counter() - t)
+    return save, load, os.path.getsize(path)
+
+
+def main():
+    n_missions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_days = int(sys.argv[2]) if len(sys.argv) > 2 else 730
+
+    codecs = [PRETTY_CODEC, JsonCodec(), GzipCodec(JsonCodec())]
+    if orjson is not None:
+        codecs += [OrjsonCodec(), GzipCodec(OrjsonCodec())]
+    print(f"padrão: {DEFAULT_CODEC.name}  arquivo morto: {ARCHIVE_CODEC.name}")
+
+    datasets = [
+        (f"{n_missions} missões", synthetic_missions(n_missions)),
+        (f"{n_days} dias de foco", synthetic_focus(n_days)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.json")
+        for label, data in datasets:
+            print(f"\n{label}")
+            print(f"{'codec':<16}{'save ms':>10}{'load ms':>10}{'KB':>10}")
+            for codec in codecs:
+                save, load, size = bench(codec, data, path)
+                print(f"{codec.name:<16}{save * 1000:>10.1f}{load * 1000:>10.1f}{size / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
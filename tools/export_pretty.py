@@ -0,0 +1,20 @@
+"""Exporta os dados do MyTasks como JSON indentado.
+
+Uso: python tools/export_pretty.py [pasta_destino]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import export_pretty
+
+
+def main():
+    dest = sys.argv[1] if len(sys.argv) > 1 else "MyTasks-export"
+    for path in export_pretty(dest):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Refaz nível, pontos, totais por categoria e sequências relendo o ledger de XP inteiro.
+
+Uso: python tools/rebuild_ledger.py   (com o MyTasks fechado)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import flush_all
+import ledger
+import streaks
+
+
+def main():
+    t = time.perf_counter()
+    totals = ledger.rebuild()
+    streaks.recompute_all()
+    flush_all()
+    elapsed = time.perf_counter() - t
+
+    u = totals.usuario
+    print(f"{totals.count} eventos em {elapsed * 1000:.1f} ms")
+    print(f"nível {u['nivel']}, xp {u['xp']}, pontos disponíveis {u['pontos_disponiveis']}")
+    for key, pontos in sorted(totals.categorias.items()):
+        print(f"  {key}: {pontos}")
+
+
+if __name__ == "__main__":
+    main()
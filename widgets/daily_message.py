@@ -1,6 +1,6 @@
 import random
 from datetime import date
-from data_manager import load_config, save_config
+from data_manager import get_config
 
 DEFAULT_MESSAGES = [
     "Você consegue.",
@@ -12,7 +12,7 @@ DEFAULT_MESSAGES = [
 
 
 def get_daily_message():
-    config = load_config()
+    config = get_config()
 
     if "daily_message" not in config:
         return random.choice(DEFAULT_MESSAGES)
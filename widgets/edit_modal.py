@@ -1,5 +1,6 @@
 from PySide6 import QtCore, QtWidgets, QtGui
-from data_manager import load_config
+from data_manager import get_config, get_category
+from recurrence import EVERY_N_DAYS, MONTHLY, WEEKLY
 
 class ConfirmDeletePopup(QtWidgets.QWidget):
     confirmed = QtCore.Signal()
@@ -81,8 +82,7 @@ class EditMissionModal(QtWidgets.QDialog):
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
         self.data = mission_data
         
-        config = load_config()
-        categorias_cfg = config.get("categorias", {})
+        categorias_cfg = get_config().get("categorias", {})
 
         if parent:
             self.setGeometry(parent.geometry())
@@ -116,7 +116,7 @@ class EditMissionModal(QtWidgets.QDialog):
                 letter-spacing: 1px; 
                 text-transform: uppercase; 
             }
-            QLineEdit, QTextEdit, QSpinBox, QDateEdit { 
+            QLineEdit, QTextEdit, QSpinBox, QDateEdit, QComboBox { 
                 background-color: #161424; 
                 color: white; 
                 border: 1px solid #322f50; 
@@ -124,7 +124,7 @@ class EditMissionModal(QtWidgets.QDialog):
                 padding: 10px; 
                 font-size: 14px;
             }
-            QLineEdit:focus, QTextEdit:focus, QSpinBox:focus, QDateEdit:focus { 
+            QLineEdit:focus, QTextEdit:focus, QSpinBox:focus, QDateEdit:focus, QComboBox:focus { 
                 border: 1px solid #8b5cf6; 
                 background-color: #1e1b2e;
             }
@@ -199,7 +199,7 @@ class EditMissionModal(QtWidgets.QDialog):
         
         self.cat_group = QtWidgets.QButtonGroup(self)
         self.cat_buttons = {}
-        categoria_inicial = self.data.get("categoria")
+        categoria_inicial = get_category(self.data.get("categoria"))
 
         row, col = 0, 0
         for key, cat in categorias_cfg.items():
@@ -232,7 +232,7 @@ class EditMissionModal(QtWidgets.QDialog):
                 }}
             """)
 
-            if nome == categoria_inicial: btn.setChecked(True)
+            if categoria_inicial and categoria_inicial["key"] == key: btn.setChecked(True)
             self.cat_group.addButton(btn)
             self.cat_buttons[nome] = btn
             cat_grid.addWidget(btn, row, col)
@@ -289,8 +289,42 @@ class EditMissionModal(QtWidgets.QDialog):
             """)
             days_layout.addWidget(btn)
             self.day_buttons.append(btn)
+        for btn, ativo in zip(self.day_buttons, self.data.get("repetida") or []):
+            btn.setChecked(bool(ativo))
         card_layout.addLayout(days_layout)
 
+        # Outras regras: a cada N dias, todo mês num dia, e até quando repete
+        rec = self.data.get("recorrencia") or {}
+        rec_layout = QtWidgets.QHBoxLayout()
+        self.rec_kind = QtWidgets.QComboBox()
+        self.rec_kind.addItem("Dias da semana", WEEKLY)
+        self.rec_kind.addItem("A cada N dias", EVERY_N_DAYS)
+        self.rec_kind.addItem("Todo mês no dia", MONTHLY)
+        self.rec_kind.setCurrentIndex(max(0, self.rec_kind.findData(rec.get("tipo", WEEKLY))))
+
+        self.rec_value = QtWidgets.QSpinBox()
+        self.rec_value.setRange(1, 31)
+        self.rec_value.setValue(int(rec.get("intervalo") or rec.get("dia") or 1))
+
+        self.rec_until = QtWidgets.QCheckBox("Até")
+        self.rec_until.setStyleSheet("color: white;")
+        self.rec_end = QtWidgets.QDateEdit()
+        self.rec_end.setCalendarPopup(True)
+        if rec.get("fim"):
+            self.rec_until.setChecked(True)
+            self.rec_end.setDate(QtCore.QDate.fromString(rec["fim"], "yyyy-MM-dd"))
+        else:
+            self.rec_end.setDate(self.edit_prazo.date().addMonths(1))
+
+        self.rec_kind.currentIndexChanged.connect(self.update_recurrence_inputs)
+        self.rec_until.toggled.connect(self.update_recurrence_inputs)
+        rec_layout.addWidget(self.rec_kind, 1)
+        rec_layout.addWidget(self.rec_value)
+        rec_layout.addWidget(self.rec_until)
+        rec_layout.addWidget(self.rec_end)
+        card_layout.addLayout(rec_layout)
+        self.update_recurrence_inputs()
+
         # Rodapé
         card_layout.addSpacing(10)
         self.btn_save = QtWidgets.QPushButton("SALVAR ALTERAÇÕES")
@@ -313,6 +347,29 @@ class EditMissionModal(QtWidgets.QDialog):
         lbl.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         return lbl
 
+    def update_recurrence_inputs(self):
+        semanal = self.rec_kind.currentData() == WEEKLY
+        for btn in self.day_buttons:
+            btn.setEnabled(semanal)
+        self.rec_value.setEnabled(not semanal)
+        self.rec_end.setEnabled(self.rec_until.isChecked())
+
+    def recurrence(self):
+        kind = self.rec_kind.currentData()
+        prazo = self.edit_prazo.date().toString("yyyy-MM-dd")
+        if kind == EVERY_N_DAYS:
+            rec = {"tipo": kind, "intervalo": self.rec_value.value(), "inicio": prazo}
+        elif kind == MONTHLY:
+            rec = {"tipo": kind, "dia": self.rec_value.value()}
+        elif self.rec_until.isChecked():
+            rec = {"tipo": kind}
+        else:
+            # Só dias da semana, sem fim: basta a lista "repetida"
+            return None
+        if self.rec_until.isChecked():
+            rec["fim"] = self.rec_end.date().toString("yyyy-MM-dd")
+        return rec
+
     def submit(self):
         categoria = ""
         for nome, btn in self.cat_buttons.items():
@@ -325,7 +382,8 @@ class EditMissionModal(QtWidgets.QDialog):
             "xp": self.edit_xp.value(),
             "categoria": categoria,
             "prazo": self.edit_prazo.date().toString("yyyy-MM-dd"),
-            "repetida": [btn.isChecked() for btn in self.day_buttons]
+            "repetida": [btn.isChecked() and btn.isEnabled() for btn in self.day_buttons],
+            "recorrencia": self.recurrence()
         }
         self.accepted.emit(new_data)
         self.accept()
@@ -0,0 +1,479 @@
+import bisect
+import datetime
+
+from PySide6 import QtCore, QtWidgets, QtGui
+from data_manager import get_category
+from recurrence import EVERY_N_DAYS, WEEKLY
+
+KIND_ROLE = QtCore.Qt.UserRole + 1
+MISSION_ROLE = QtCore.Qt.UserRole + 2
+STATUS_ROLE = QtCore.Qt.UserRole + 3
+PRAZO_ROLE = QtCore.Qt.UserRole + 4
+
+SECTION = "section"
+MISSION = "mission"
+
+CARD_HEIGHT = 100
+CARD_SPACING = 12
+SECTION_HEIGHT = 40
+MARGIN_X, MARGIN_Y = 15, 12
+BUTTON = 24
+DAYS_NAMES = ["S", "T", "Q", "Q", "S", "S", "D"]
+
+WHITE = QtGui.QColor("#FFFFFF")
+SUB = QtGui.QColor(255, 255, 255, 153)
+PURPLE = QtGui.QColor("#5E12F8")
+RED = QtGui.QColor("#e74c3c")
+RED_TEXT = QtGui.QColor("#ff6b6b")
+YELLOW = QtGui.QColor("#f1c40f")
+
+
+class MissionListModel(QtCore.QAbstractListModel):
+    """Linhas da lista de missões: títulos de seção (ATIVAS/ATRASADAS/CONCLUÍDAS) e missões.
+
+    Cada linha é (tipo, missão ou título, status visual, prazo). Status e prazo
+    ficam separados da missão para a tela poder mostrar uma mudança antes do save.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, item, status, prazo = self._rows[index.row()]
+        if role == KIND_ROLE:
+            return kind
+        if role == QtCore.Qt.DisplayRole:
+            return item if kind == SECTION else item["titulo"]
+        if kind == SECTION:
+            return None
+        if role == MISSION_ROLE:
+            return item
+        if role == STATUS_ROLE:
+            return status
+        if role == PRAZO_ROLE:
+            return prazo
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        if self._rows[index.row()][0] == SECTION:
+            return QtCore.Qt.ItemIsEnabled
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    @staticmethod
+    def _key(row):
+        kind, item = row[:2]
+        return (kind, item if kind == SECTION else item["id"])
+
+    @staticmethod
+    def _same(old, new):
+        # As visões do store são reaproveitadas quando a missão não mudou, então `is` resolve quase sempre
+        return (old[1] is new[1] or old[1] == new[1]) and old[2:] == new[2:]
+
+    def set_sections(self, sections):
+        """sections: [(título, status visual, [missões])]; seções vazias são puladas.
+
+        Reconcilia por chave com o que já está na lista: só as linhas que mudaram
+        são atualizadas, inseridas, removidas ou movidas de seção.
+        """
+        rows = []
+        for title, status, missions in sections:
+            if missions:
+                rows.append((SECTION, title, None, None))
+                rows.extend((MISSION, m, status, m["prazo"]) for m in missions)
+
+        new_keys = {self._key(r) for r in rows}
+        common = sum(1 for r in self._rows if self._key(r) in new_keys)
+        if common * 2 < max(len(rows), len(self._rows)):
+            # Troca de aba: quase tudo é diferente e um reset sai mais barato
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+        self._reconcile(rows, new_keys)
+
+    def _reconcile(self, rows, new_keys):
+        parent = QtCore.QModelIndex()
+
+        # 1. Remove o que saiu, em blocos contíguos de baixo para cima
+        row = len(self._rows) - 1
+        while row >= 0:
+            if self._key(self._rows[row]) in new_keys:
+                row -= 1
+                continue
+            end = row
+            while row > 0 and self._key(self._rows[row - 1]) not in new_keys:
+                row -= 1
+            self.beginRemoveRows(parent, row, end)
+            del self._rows[row:end + 1]
+            self.endRemoveRows()
+            row -= 1
+
+        # 2. As linhas que já estão na ordem certa (maior subsequência crescente) não se mexem
+        new_pos = {self._key(r): i for i, r in enumerate(rows)}
+        stable = _increasing_run({self._key(r): new_pos[self._key(r)] for r in self._rows})
+        old_keys = {self._key(r) for r in self._rows}
+
+        # 3. Percorre a lista nova: atualiza no lugar, move as que mudaram de lugar ou insere
+        i = 0
+        while i < len(rows):
+            new = rows[i]
+            key = self._key(new)
+            current = self._key(self._rows[i]) if i < len(self._rows) else None
+            if current == key:
+                if not self._same(self._rows[i], new):
+                    self._rows[i] = new
+                    index = self.index(i)
+                    self.dataChanged.emit(index, index)
+                i += 1
+            elif key not in old_keys:
+                end = i
+                while end + 1 < len(rows) and self._key(rows[end + 1]) not in old_keys:
+                    end += 1
+                self.beginInsertRows(parent, i, end)
+                self._rows[i:i] = rows[i:end + 1]
+                self.endInsertRows()
+                i = end + 1
+            elif key not in stable:
+                src = next(j for j in range(i + 1, len(self._rows)) if self._key(self._rows[j]) == key)
+                self.beginMoveRows(parent, src, src, parent, i)
+                self._rows.insert(i, self._rows.pop(src))
+                self.endMoveRows()
+            else:
+                # Quem está aqui vai para mais abaixo: desce até antes da primeira linha
+                # estável que vem depois dela na lista nova
+                target = new_pos[current]
+                dest = i + 1
+                while dest < len(self._rows):
+                    k = self._key(self._rows[dest])
+                    if k in stable and new_pos[k] > target:
+                        break
+                    dest += 1
+                self.beginMoveRows(parent, i, i, parent, dest)
+                self._rows.insert(dest - 1, self._rows.pop(i))
+                self.endMoveRows()
+
+    def mission_id(self, row):
+        kind, item = self._rows[row][:2]
+        return item["id"] if kind == MISSION else None
+
+    def set_preview(self, row, status=None, prazo=None):
+        # Mostra na hora o que a tela acabou de pedir; o refresh pelo bus confirma ou desfaz
+        kind, item, old_status, old_prazo = self._rows[row]
+        self._rows[row] = (kind, item, status or old_status, prazo or old_prazo)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+
+def _increasing_run(positions):
+    """Chaves da maior subsequência crescente de posições (dict chave -> posição, na ordem atual)."""
+    keys = list(positions)
+    tails, tail_idx, prev = [], [], [None] * len(keys)
+    for i, key in enumerate(keys):
+        p = positions[key]
+        k = bisect.bisect_left(tails, p)
+        if k == len(tails):
+            tails.append(p)
+            tail_idx.append(i)
+        else:
+            tails[k] = p
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else None
+    result = set()
+    i = tail_idx[-1] if tail_idx else None
+    while i is not None:
+        result.add(keys[i])
+        i = prev[i]
+    return result
+
+
+class MissionDelegate(QtWidgets.QStyledItemDelegate):
+    """Pinta o card da missão direto no viewport, sem widgets por linha."""
+
+    def sizeHint(self, option, index):
+        if index.data(KIND_ROLE) == SECTION:
+            return QtCore.QSize(option.rect.width(), SECTION_HEIGHT)
+        return QtCore.QSize(option.rect.width(), CARD_HEIGHT + CARD_SPACING)
+
+    # ---------- geometria ----------
+    @staticmethod
+    def card_rect(rect):
+        return QtCore.QRectF(rect.adjusted(1, 1, -1, -CARD_SPACING - 1))
+
+    def part_at(self, rect, pos):
+        """Que parte do card está em `pos`: status, menu, defer ou card."""
+        card = self.card_rect(rect)
+        for name, part in self.button_rects(card).items():
+            if part.contains(QtCore.QPointF(pos)):
+                return name
+        return "card" if card.contains(QtCore.QPointF(pos)) else None
+
+    @staticmethod
+    def button_rects(card):
+        cy = card.center().y() - BUTTON / 2
+        defer = QtCore.QRectF(card.right() - MARGIN_X - BUTTON, cy, BUTTON, BUTTON)
+        menu = defer.translated(-BUTTON - MARGIN_X, 0)
+        status = QtCore.QRectF(card.left() + MARGIN_X, cy, BUTTON, BUTTON)
+        return {"status": status, "menu": menu, "defer": defer}
+
+    # ---------- pintura ----------
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        if index.data(KIND_ROLE) == SECTION:
+            self.paint_section(painter, option.rect, index.data())
+        else:
+            self.paint_card(painter, option, index)
+        painter.restore()
+
+    def paint_section(self, painter, rect, title):
+        font = QtGui.QFont(painter.font())
+        font.setPixelSize(11)
+        font.setLetterSpacing(QtGui.QFont.AbsoluteSpacing, 1)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor(255, 255, 255, 128))
+        text_rect = rect.adjusted(0, 15, 0, -5)
+        painter.drawText(text_rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, title)
+
+    def paint_card(self, painter, option, index):
+        m = index.data(MISSION_ROLE)
+        status = index.data(STATUS_ROLE)
+        prazo = index.data(PRAZO_ROLE)
+        is_done, is_late = status == "Concluída", status == "Atrasada"
+        hover = option.state & QtWidgets.QStyle.State_MouseOver
+        selected = option.state & QtWidgets.QStyle.State_Selected
+
+        card = self.card_rect(option.rect)
+        if is_done:
+            bg, border, border_w = QtGui.QColor(30, 27, 46, 153), QtGui.QColor(255, 255, 255, 13), 1
+        elif is_late:
+            bg, border, border_w = QtGui.QColor(231, 76, 60, 26), RED, 2
+        else:
+            bg, border, border_w = QtGui.QColor("#1b1430"), QtGui.QColor("#322f50"), 1
+        if hover or selected:
+            border, border_w = PURPLE, 1
+        painter.setPen(QtGui.QPen(border, border_w))
+        painter.setBrush(bg)
+        painter.drawRoundedRect(card, 12, 12)
+        if hover or selected:
+            painter.setBrush(QtGui.QColor(94, 18, 248, 13 if hover else 40))
+            painter.drawRoundedRect(card, 12, 12)
+
+        buttons = self.button_rects(card)
+        self.paint_status(painter, buttons["status"], is_done, is_late)
+
+        # Coluna da direita: XP e prazo
+        right = buttons["menu"].left() - MARGIN_X
+        xp_rect = QtCore.QRectF(right - 80, card.center().y() - 20, 80, 20)
+        prazo_rect = xp_rect.translated(0, 20)
+        self.draw_text(painter, xp_rect, f"{m['xp']} XP", 14, PURPLE, QtGui.QFont.Black, QtCore.Qt.AlignRight)
+        self.paint_prazo(painter, prazo_rect, prazo, is_late)
+
+        self.draw_text(painter, buttons["menu"], "⋮", 18, SUB, QtGui.QFont.Bold, QtCore.Qt.AlignCenter)
+        defer_color = YELLOW if hover and self.parent() and self.parent().hover_part == "defer" else SUB
+        self.draw_text(painter, buttons["defer"], "󰔟", 16, defer_color, QtGui.QFont.Normal, QtCore.Qt.AlignCenter)
+
+        # Textos
+        left = buttons["status"].right() + MARGIN_X
+        width = xp_rect.left() - MARGIN_X - left
+        top = card.top() + MARGIN_Y + 4
+        title_color = QtGui.QColor(255, 255, 255, 51) if is_done else RED_TEXT if is_late else WHITE
+        self.draw_text(
+            painter, QtCore.QRectF(left, top, width, 20), m["titulo"], 15, title_color,
+            QtGui.QFont.Black if is_late else QtGui.QFont.Bold, QtCore.Qt.AlignLeft, strike=is_done
+        )
+        desc = m["descricao"] or "Sem descrição"
+        desc_width = min(250, width)
+        self.draw_text(painter, QtCore.QRectF(left, top + 22, desc_width, 18), desc, 12, SUB, QtGui.QFont.Normal, QtCore.Qt.AlignLeft)
+        self.paint_tags(painter, QtCore.QPointF(left, top + 46), m)
+
+    def draw_text(self, painter, rect, text, px, color, weight, align, strike=False):
+        font = QtGui.QFont(painter.font())
+        font.setPixelSize(px)
+        font.setWeight(weight)
+        font.setStrikeOut(strike)
+        font.setLetterSpacing(QtGui.QFont.AbsoluteSpacing, 0)
+        painter.setFont(font)
+        painter.setPen(color)
+        text = QtGui.QFontMetrics(font).elidedText(text, QtCore.Qt.ElideRight, int(rect.width()))
+        painter.drawText(rect, align | QtCore.Qt.AlignVCenter, text)
+
+    def paint_status(self, painter, rect, is_done, is_late):
+        rect = rect.adjusted(1, 1, -1, -1)
+        if is_done:
+            painter.setPen(QtGui.QPen(PURPLE, 2))
+            painter.setBrush(PURPLE)
+        else:
+            painter.setPen(QtGui.QPen(RED if is_late else WHITE, 2))
+            painter.setBrush(QtCore.Qt.NoBrush)
+        painter.drawEllipse(rect)
+
+    def paint_prazo(self, painter, rect, prazo, is_late):
+        if not prazo:
+            return
+        p_date = datetime.date.fromisoformat(prazo)
+        today = datetime.date.today()
+        if is_late:
+            self.draw_text(painter, rect, "ATRASADA", 10, RED_TEXT, QtGui.QFont.Black, QtCore.Qt.AlignRight)
+        elif p_date == today:
+            self.draw_text(painter, rect, "Hoje", 11, WHITE, QtGui.QFont.Bold, QtCore.Qt.AlignRight)
+        elif p_date == today + datetime.timedelta(days=1):
+            self.draw_text(painter, rect, "Amanhã", 11, YELLOW, QtGui.QFont.Bold, QtCore.Qt.AlignRight)
+        else:
+            self.draw_text(painter, rect, p_date.strftime("%d/%m"), 11, SUB, QtGui.QFont.Normal, QtCore.Qt.AlignRight)
+
+    def paint_tags(self, painter, origin, m):
+        x = origin.x()
+        categoria = m["categoria"]
+        if categoria:
+            cor, nome = "#777777", categoria.upper()
+            dados = get_category(categoria)
+            if dados:
+                cor = dados.get("cor", "#5E12F8")
+                nome = dados.get("nome", dados["key"]).upper()
+            font = QtGui.QFont(painter.font())
+            font.setPixelSize(9)
+            font.setWeight(QtGui.QFont.Black)
+            chip_w = QtGui.QFontMetrics(font).horizontalAdvance(f" {nome} ") + 4
+            chip = QtCore.QRectF(x, origin.y(), chip_w, 16)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(QtGui.QColor(cor))
+            painter.drawRoundedRect(chip, 4, 4)
+            self.draw_text(painter, chip, f" {nome} ", 9, QtGui.QColor("#0e0b1c"), QtGui.QFont.Black, QtCore.Qt.AlignCenter)
+            x += chip_w + 8
+
+        rule = m.rule
+        if rule is None:
+            return
+        if rule.kind == WEEKLY:
+            for i in range(7):
+                active = rule.mask >> i & 1
+                box = QtCore.QRectF(x, origin.y() + 1, 14, 14)
+                if active:
+                    painter.setPen(QtCore.Qt.NoPen)
+                    painter.setBrush(QtGui.QColor(94, 18, 248, 26))
+                    painter.drawRoundedRect(box, 3, 3)
+                color = PURPLE if active else QtGui.QColor(255, 255, 255, 38)
+                self.draw_text(painter, box, DAYS_NAMES[i], 8, color, QtGui.QFont.Black, QtCore.Qt.AlignCenter)
+                x += 14 + 3
+            x += 5
+            text = ""
+        elif rule.kind == EVERY_N_DAYS:
+            text = f"A CADA {rule.interval} DIAS "
+        else:
+            text = f"TODO DIA {rule.day} "
+        if rule.end:
+            text += f"ATÉ {rule.end:%d/%m}"
+        if text:
+            self.draw_text(painter, QtCore.QRectF(x, origin.y(), 200, 16), text.strip(), 9, PURPLE, QtGui.QFont.Black, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+
+
+class MissionListView(QtWidgets.QListView):
+    """Lista virtualizada de missões; os sinais levam o id da missão.
+
+    Ctrl+clique e Shift+clique selecionam várias missões para as ações em lote.
+    """
+
+    status_changed = QtCore.Signal(int, bool)
+    clicked_mission = QtCore.Signal(int)
+    edit_requested = QtCore.Signal(int)
+    associate_requested = QtCore.Signal(int)
+    date_changed = QtCore.Signal(int, str)
+    selection_changed = QtCore.Signal(list)
+
+    MENU_STYLE = "QMenu { background-color: #1e1b2e; color: white; border: 1px solid #322f50; border-radius: 8px; padding: 5px; } QMenu::item:selected { background-color: #5E12F8; border-radius: 4px; }"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.list_model = MissionListModel(self)
+        self.delegate = MissionDelegate(self)
+        self.hover_part = None
+        self.setModel(self.list_model)
+        self.setItemDelegate(self.delegate)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(QtCore.Qt.WA_Hover, True)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.setStyleSheet("QListView { background: transparent; border: none; outline: none; }")
+        self.selectionModel().selectionChanged.connect(lambda *args: self.selection_changed.emit(self.selected_ids()))
+
+    def selected_ids(self):
+        rows = sorted(index.row() for index in self.selectionModel().selectedIndexes())
+        return [self.list_model.mission_id(row) for row in rows]
+
+    @staticmethod
+    def _selecting(event):
+        return event.modifiers() & (QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier)
+
+    def mousePressEvent(self, event):
+        # Sem Ctrl/Shift o clique é do card (abrir, concluir, adiar), não da seleção
+        if self._selecting(event) or event.button() != QtCore.Qt.LeftButton:
+            super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.key() == QtCore.Qt.Key_Escape and self.selectionModel().hasSelection():
+            self.clearSelection()
+            return
+        super().keyPressEvent(event)
+
+    def _hit(self, pos):
+        index = self.indexAt(pos)
+        if not index.isValid() or index.data(KIND_ROLE) != MISSION:
+            return index, None
+        return index, self.delegate.part_at(self.visualRect(index), pos)
+
+    def mouseMoveEvent(self, event):
+        index, part = self._hit(event.position().toPoint())
+        if part != self.hover_part:
+            self.hover_part = part
+            self.viewport().update()
+        self.viewport().setCursor(QtCore.Qt.PointingHandCursor if part in ("status", "menu", "defer") else QtCore.Qt.ArrowCursor)
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        index, part = self._hit(event.position().toPoint())
+        if event.button() != QtCore.Qt.LeftButton or part is None or (part == "card" and self._selecting(event)):
+            return super().mouseReleaseEvent(event)
+
+        row = index.row()
+        mission_id = self.list_model.mission_id(row)
+        if part == "status":
+            done = index.data(STATUS_ROLE) != "Concluída"
+            self.list_model.set_preview(row, status="Concluída" if done else "Pendente")
+            self.status_changed.emit(mission_id, done)
+        elif part == "defer":
+            tomorrow = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+            status = "Pendente" if index.data(STATUS_ROLE) == "Atrasada" else None
+            self.list_model.set_preview(row, status=status, prazo=tomorrow)
+            self.date_changed.emit(mission_id, tomorrow)
+        elif part == "menu":
+            self.open_menu(mission_id)
+        else:
+            self.edit_requested.emit(mission_id)
+
+    def open_menu(self, mission_id):
+        menu = QtWidgets.QMenu(self)
+        menu.setWindowFlags(menu.windowFlags() | QtCore.Qt.FramelessWindowHint)
+        menu.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+        menu.setStyleSheet(self.MENU_STYLE)
+
+        action_details = menu.addAction("Ver Detalhes")
+        action_associate = menu.addAction("Associar ao Foco")
+        action_edit = menu.addAction("Editar Missão")
+
+        action = menu.exec(QtGui.QCursor.pos())
+
+        if action == action_details:
+            self.clicked_mission.emit(mission_id)
+        elif action == action_associate:
+            self.associate_requested.emit(mission_id)
+        elif action == action_edit:
+            self.edit_requested.emit(mission_id)
@@ -1,5 +1,5 @@
 from PySide6 import QtCore, QtWidgets, QtGui
-from data_manager import load_notes, save_notes
+from data_manager import load_notes, next_id, save_notes
 import datetime
 
 class ConfirmDeletePopup(QtWidgets.QWidget):
@@ -196,8 +196,8 @@ class NoteModal(QtWidgets.QWidget):
                     n.update({"title": title, "text": text, "color": self.current_color})
                     break
         else:
-            new_id = max([n["id"] for n in data["notes"]] + [0]) + 1
-            self.note_data = {"id": new_id, "title": title, "text": text, "color": self.current_color, "created_at": datetime.datetime.now().isoformat()}
+            new_id = next_id("notes")
+            self.note_data = {"id": new_id, "title": title, "text": text, "color": self.current_color, "pinned": False, "created_at": datetime.datetime.now().isoformat()}
             data["notes"].append(self.note_data)
         save_notes(data)
         if close_after: